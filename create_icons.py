@@ -3,17 +3,25 @@
 
 """
 Скрипт для создания простых иконок для приложения
+
+Иконки рисуются средствами Pillow без запуска QApplication,
+поэтому скрипт можно выполнять при сборке без графического окружения.
 """
 
 import os
-import sys
-import numpy as np
-from PyQt5.QtCore import Qt, QSize, QRect
-from PyQt5.QtGui import QPainter, QColor, QBrush, QPen, QFont, QIcon, QPixmap, QPainterPath
-from PyQt5.QtWidgets import QApplication
+import math
+from PIL import Image, ImageDraw
+
+# Путь к директории с иконками (тот же, что ICONS_DIR в ui/styles.py; модуль стилей
+# не импортируется, так как он требует PyQt5)
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ui', 'icons')
+
+# Размеры, в которых сохраняется каждая иконка (совпадают с ICON_SIZES в ui/styles.py)
+ICON_SIZES = (16, 24, 32, 48, 64, 128)
 
-# Путь к директории с иконками
-ICONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ui', 'icons')
+# Коэффициент суперсэмплинга: иконка рисуется в увеличенном масштабе
+# и затем уменьшается, что заменяет сглаживание QPainter
+SUPERSAMPLE = 4
 
 # Цвета
 COLORS = {
@@ -30,6 +38,11 @@ COLORS = {
 }
 
 
+def _px(value):
+    """Переводит размер в пикселях итоговой иконки в пиксели увеличенного холста"""
+    return int(round(value * SUPERSAMPLE))
+
+
 def create_icon(name, draw_func, size=64):
     """
     Создает иконку и сохраняет её в директории иконок
@@ -38,32 +51,31 @@ def create_icon(name, draw_func, size=64):
         name (str): Имя иконки
         draw_func (callable): Функция для рисования иконки
         size (int): Размер иконки в пикселях
-    """
-    # Создаем QPixmap
-    pixmap = QPixmap(size, size)
-    pixmap.fill(Qt.transparent)
     
-    # Создаем QPainter
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.Antialiasing, True)
-    painter.setRenderHint(QPainter.TextAntialiasing, True)
-    painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+    Returns:
+        PIL.Image.Image: Изображение иконки
+    """
+    file_path = os.path.join(ICONS_DIR, f"{name}.png")
     
-    # Рисуем иконку
-    draw_func(painter, size)
+    # Если иконка уже создана и новее этого скрипта, используем её
+    if os.path.exists(file_path) and os.path.getmtime(file_path) >= os.path.getmtime(__file__):
+        print(f"Иконка актуальна: {file_path}")
+        return Image.open(file_path)
     
-    # Завершаем рисование
-    painter.end()
+    # Рисуем иконку на прозрачном холсте увеличенного размера
+    canvas_size = size * SUPERSAMPLE
+    image = Image.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
+    draw_func(ImageDraw.Draw(image), canvas_size)
     
-    # Сохраняем иконку
-    file_path = os.path.join(ICONS_DIR, f"{name}.png")
-    pixmap.save(file_path)
+    # Уменьшаем до итогового размера и сохраняем иконку
+    image = image.resize((size, size), Image.LANCZOS)
+    image.save(file_path, 'PNG', optimize=True)
     print(f"Иконка сохранена: {file_path}")
     
-    return pixmap
+    return image
 
 
-def draw_file_icon(painter, size):
+def draw_file_icon(draw, size):
     """Рисует иконку файла"""
     # Размеры и отступы - преобразуем в целые числа
     margin = int(size * 0.1)
@@ -71,38 +83,27 @@ def draw_file_icon(painter, size):
     height = int(size - 2 * margin)
     corner = int(size * 0.15)
     
-    # Рисуем документ с загнутым уголком
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor('#FFFFFF')))
-    painter.drawRoundedRect(margin, margin, width, height, 5, 5)
-    
-    # Рисуем границу документа
-    painter.setPen(QPen(QColor(COLORS['primary']), 2))
-    painter.setBrush(Qt.NoBrush)
-    painter.drawRoundedRect(margin, margin, width, height, 5, 5)
+    # Рисуем документ с загнутым уголком и его границу
+    draw.rounded_rectangle([margin, margin, margin + width, margin + height], radius=_px(5),
+                           fill=COLORS['white'], outline=COLORS['primary'], width=_px(2))
     
     # Рисуем загнутый уголок
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor(COLORS['primary_light'])))
-    painter.drawRect(size - margin - corner, margin, corner, corner)
+    draw.rectangle([size - margin - corner, margin, size - margin, margin + corner], fill=COLORS['primary_light'])
     
     # Рисуем линию загиба
-    painter.setPen(QPen(QColor(COLORS['primary']), 2))
-    painter.drawLine(size - margin - corner, margin, size - margin - corner, margin + corner)
-    painter.drawLine(size - margin - corner, margin + corner, size - margin, margin + corner)
+    draw.line([(size - margin - corner, margin), (size - margin - corner, margin + corner),
+               (size - margin, margin + corner)], fill=COLORS['primary'], width=_px(2))
     
     # Рисуем линии текста
     line_margin = int(size * 0.25)
-    line_height = int(size * 0.08)
     line_spacing = int(size * 0.14)
     
-    painter.setPen(QPen(QColor(COLORS['gray']), 1))
     for i in range(4):
         y = margin + line_margin + i * line_spacing
-        painter.drawLine(margin + line_margin, y, size - margin - line_margin, y)
+        draw.line([(margin + line_margin, y), (size - margin - line_margin, y)], fill=COLORS['gray'], width=_px(1))
 
 
-def draw_chart_icon(painter, size):
+def draw_chart_icon(draw, size):
     """Рисует иконку графика"""
     # Размеры и отступы - преобразуем в целые числа
     margin = int(size * 0.15)
@@ -110,14 +111,11 @@ def draw_chart_icon(painter, size):
     height = int(size - 2 * margin)
     
     # Рисуем фон
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor('#FFFFFF')))
-    painter.drawRect(margin, margin, width, height)
+    draw.rectangle([margin, margin, margin + width, margin + height], fill=COLORS['white'])
     
     # Рисуем оси
-    painter.setPen(QPen(QColor('#000000'), 2))
-    painter.drawLine(margin, size - margin, size - margin, size - margin)  # Ось X
-    painter.drawLine(margin, margin, margin, size - margin)  # Ось Y
+    draw.line([(margin, margin), (margin, size - margin), (size - margin, size - margin)],
+              fill='#000000', width=_px(2))
     
     # Рисуем линию графика - преобразуем все координаты в целые числа
     points = [
@@ -129,94 +127,75 @@ def draw_chart_icon(painter, size):
     ]
     
     # Рисуем линию
-    painter.setPen(QPen(QColor(COLORS['primary']), 3))
-    for i in range(len(points) - 1):
-        painter.drawLine(points[i][0], points[i][1], points[i+1][0], points[i+1][1])
+    draw.line(points, fill=COLORS['primary'], width=_px(3), joint='curve')
     
     # Рисуем точки
-    painter.setPen(QPen(QColor(COLORS['primary']), 1))
-    painter.setBrush(QBrush(QColor('#FFFFFF')))
-    for point in points:
-        painter.drawEllipse(point[0] - 4, point[1] - 4, 8, 8)
+    marker_radius = _px(4)
+    for x, y in points:
+        draw.ellipse([x - marker_radius, y - marker_radius, x + marker_radius, y + marker_radius],
+                     fill=COLORS['white'], outline=COLORS['primary'], width=_px(1))
 
 
-def draw_data_icon(painter, size):
+def draw_data_icon(draw, size):
     """Рисует иконку данных"""
     # Размеры и отступы - преобразуем в целые числа
     margin = int(size * 0.15)
     width = int(size - 2 * margin)
     height = int(size - 2 * margin)
     
-    # Рисуем фон таблицы
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor('#FFFFFF')))
-    painter.drawRect(margin, margin, width, height)
-    
-    # Рисуем рамку таблицы
-    painter.setPen(QPen(QColor(COLORS['primary']), 2))
-    painter.setBrush(Qt.NoBrush)
-    painter.drawRect(margin, margin, width, height)
+    # Рисуем фон и рамку таблицы
+    draw.rectangle([margin, margin, margin + width, margin + height],
+                   fill=COLORS['white'], outline=COLORS['primary'], width=_px(2))
     
     # Рисуем заголовок таблицы
     header_height = int(height * 0.2)
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor(COLORS['primary_light'])))
-    painter.drawRect(margin, margin, width, header_height)
+    draw.rectangle([margin, margin, margin + width, margin + header_height], fill=COLORS['primary_light'])
     
     # Рисуем линии таблицы
-    painter.setPen(QPen(QColor(COLORS['gray']), 1))
-    
-    # Горизонтальные линии
     row_count = 4
     row_height = (height - header_height) / row_count
-    for i in range(1, row_count + 1):
-        y = int(margin + header_height + i * row_height)
-        painter.drawLine(margin, y, margin + width, y)
+    rows_y = [margin + header_height + row_height * (i + 1) for i in range(row_count)]
     
-    # Вертикальные линии
     col_count = 3
     col_width = width / col_count
-    for i in range(1, col_count):
-        x = int(margin + i * col_width)
-        painter.drawLine(x, margin, x, margin + height)
+    cols_x = [margin + col_width * (i + 1) for i in range(col_count - 1)]
+    
+    for y in rows_y:
+        draw.line([(margin, y), (margin + width, y)], fill=COLORS['gray'], width=_px(1))
+    for x in cols_x:
+        draw.line([(x, margin), (x, margin + height)], fill=COLORS['gray'], width=_px(1))
 
 
-def draw_settings_icon(painter, size):
+def draw_settings_icon(draw, size):
     """Рисует иконку настроек"""
     # Размеры и отступы - преобразуем в целые числа
-    margin = int(size * 0.15)
     center = int(size / 2)
     radius = int(size * 0.3)
     tooth_length = int(size * 0.12)
     
     # Рисуем внешний круг
-    painter.setPen(QPen(QColor(COLORS['gray']), 2))
-    painter.setBrush(QBrush(QColor('#FFFFFF')))
-    painter.drawEllipse(center - radius, center - radius, radius * 2, radius * 2)
+    draw.ellipse([center - radius, center - radius, center + radius, center + radius],
+                 fill=COLORS['white'], outline=COLORS['gray'], width=_px(2))
     
     # Рисуем зубцы шестеренки
     tooth_count = 8
-    angle_step = 360 / tooth_count
+    outer = radius + tooth_length
+    
     for i in range(tooth_count):
-        angle = i * angle_step
-        rad_angle = angle * 3.14159 / 180
-        
-        x1 = int(center + radius * 0.8 * (1 if i % 2 == 0 else 0.9) * np.cos(rad_angle))
-        y1 = int(center + radius * 0.8 * (1 if i % 2 == 0 else 0.9) * np.sin(rad_angle))
-        
-        x2 = int(center + (radius + tooth_length) * np.cos(rad_angle))
-        y2 = int(center + (radius + tooth_length) * np.sin(rad_angle))
-        
-        painter.drawLine(x1, y1, x2, y2)
+        angle = i * math.tau / tooth_count
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        inner = (0.8 if i % 2 == 0 else 0.72) * radius
+        draw.line([(center + inner * cos_a, center + inner * sin_a),
+                   (center + outer * cos_a, center + outer * sin_a)], fill=COLORS['gray'], width=_px(2))
     
     # Рисуем внутренний круг
     inner_radius = int(radius * 0.5)
-    painter.setPen(QPen(QColor(COLORS['primary']), 2))
-    painter.setBrush(QBrush(QColor(COLORS['primary_light'])))
-    painter.drawEllipse(center - inner_radius, center - inner_radius, inner_radius * 2, inner_radius * 2)
+    draw.ellipse([center - inner_radius, center - inner_radius, center + inner_radius, center + inner_radius],
+                 fill=COLORS['primary_light'], outline=COLORS['primary'], width=_px(2))
 
 
-def draw_down_arrow_icon(painter, size):
+def draw_down_arrow_icon(draw, size):
     """Рисует иконку стрелки вниз"""
     # Размеры и отступы - преобразуем в целые числа
     margin = int(size * 0.2)
@@ -224,28 +203,16 @@ def draw_down_arrow_icon(painter, size):
     height = int(width * 0.6)
     
     # Рисуем треугольник
-    painter.setPen(Qt.NoPen)
-    painter.setBrush(QBrush(QColor(COLORS['primary'])))
-    
     points = [
         (margin, margin),
         (size - margin, margin),
         (int(size / 2), margin + height)
     ]
     
-    path = QPainterPath()
-    path.moveTo(points[0][0], points[0][1])
-    for point in points[1:]:
-        path.lineTo(point[0], point[1])
-    path.closeSubpath()
-    
-    painter.drawPath(path)
+    draw.polygon(points, fill=COLORS['primary'])
 
 
 if __name__ == "__main__":
-    # Создаем приложение Qt
-    app = QApplication(sys.argv)
-    
     # Проверяем существование директории для иконок
     if not os.path.exists(ICONS_DIR):
         os.makedirs(ICONS_DIR)
@@ -261,6 +228,9 @@ if __name__ == "__main__":
     ]
     
     for name, draw_func in icons_to_create:
+        # Основной файл используется в таблице стилей, набор размеров - в load_icon()
         create_icon(name, draw_func)
+        for size in ICON_SIZES:
+            create_icon(f"{name}_{size}", draw_func, size=size)
     
-    print("Все иконки созданы успешно!")
\ No newline at end of file
+    print("Все иконки созданы успешно!")
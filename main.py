@@ -13,9 +13,11 @@ import sys
 import os
 import traceback
 
-# Добавляем директорию проекта в путь
+# Добавляем директорию проекта в путь, только если её там ещё нет
+# (при запуске `python main.py` она уже стоит первой в sys.path)
 project_path = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(project_path)
+if project_path not in sys.path:
+    sys.path.insert(0, project_path)
 
 # Устанавливаем обработчик исключений для вывода ошибок в консоль
 def exception_hook(exctype, value, tb):
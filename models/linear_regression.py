@@ -1,6 +1,126 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score, mean_squared_error
+from functools import lru_cache, cached_property
+
+# Модуль scipy.stats импортируется при первом обращении (см. _get_stats)
+_stats = None
+
+
+def _ols_moments(X, y):
+    """
+    Вычисление средних и сумм произведений отклонений средствами numpy
+    
+    Args:
+        X (numpy.ndarray): Одномерный массив значений X
+        y (numpy.ndarray): Одномерный массив значений y
+    
+    Returns:
+        tuple: (mean_x, mean_y, Sxx, Sxy, Syy)
+    """
+    mean_x = np.mean(X)
+    mean_y = np.mean(y)
+    dx = X - mean_x
+    dy = y - mean_y
+    return mean_x, mean_y, np.dot(dx, dx), np.dot(dx, dy), np.dot(dy, dy)
+
+
+def _get_stats():
+    """
+    Ленивый импорт scipy.stats, чтобы не замедлять запуск приложения
+    
+    Returns:
+        module: Модуль scipy.stats
+    """
+    global _stats
+    if _stats is None:
+        from scipy import stats
+        _stats = stats
+    return _stats
+
+
+@lru_cache(maxsize=256)
+def _t_ppf_975(df):
+    """
+    Критическое значение t-распределения для 95% доверительного интервала
+    
+    Args:
+        df (int): Число степеней свободы
+    
+    Returns:
+        float: Квантиль t-распределения уровня 0.975
+    """
+    return _get_stats().t.ppf(0.975, df)
+
+
+# Характер линейной зависимости по знаку наклона и уровню R² (0 - низкий, 1 - средний, 2 - высокий)
+_STRENGTH = {
+    (1, 2): 'сильная положительная',
+    (-1, 2): 'сильная отрицательная',
+    (1, 1): 'умеренная положительная',
+    (-1, 1): 'умеренная отрицательная',
+    (1, 0): 'слабая положительная',
+    (-1, 0): 'слабая отрицательная'
+}
+
+# Качество соответствия модели данным по уровню R²
+_FIT_QUALITY = ('низком', 'среднем', 'высоком')
+
+# Статистики коэффициентов хранятся одной структурированной таблицей:
+# строка 0 - Y-пересечение, строка 1 - коэффициент наклона
+COEF_DTYPE = np.dtype([
+    ('value', 'f8'),  # Значение коэффициента
+    ('se', 'f8'),  # Стандартная ошибка
+    ('t', 'f8'),  # t-статистика
+    ('p', 'f8'),  # P-значение
+    ('ci_lo', 'f8'),  # Нижняя граница 95% доверительного интервала
+    ('ci_hi', 'f8')  # Верхняя граница 95% доверительного интервала
+])
+_INTERCEPT, _SLOPE = 0, 1
+
+# Соответствие полей COEF_DTYPE названиям столбцов в сводке
+_COEF_SUMMARY_FIELDS = (
+    ('value', "Коэффициент"),
+    ('se', "Стандартная ошибка"),
+    ('t', "t-статистика"),
+    ('p', "P-Значение"),
+    ('ci_lo', "Нижние 95%"),
+    ('ci_hi', "Верхние 95%")
+)
+
+
+def _coef_property(index, field, doc):
+    """
+    Создает свойство только для чтения, возвращающее поле из таблицы коэффициентов
+    
+    Args:
+        index (int): Номер строки (_INTERCEPT или _SLOPE)
+        field (str): Имя поля COEF_DTYPE
+        doc (str): Описание свойства
+    
+    Returns:
+        property: Свойство, возвращающее значение или None, если оно не вычислено
+    """
+    def getter(self):
+        return self._coef_field(index, field)
+    return property(getter, doc=doc)
+
+
+def _interval_property(index, doc):
+    """
+    Создает свойство, возвращающее доверительный интервал коэффициента в виде кортежа
+    
+    Args:
+        index (int): Номер строки (_INTERCEPT или _SLOPE)
+        doc (str): Описание свойства
+    
+    Returns:
+        property: Свойство, возвращающее (нижняя, верхняя) или None
+    """
+    def getter(self):
+        lower = self._coef_field(index, 'ci_lo')
+        if lower is None:
+            return None
+        return (lower, self._coef_field(index, 'ci_hi'))
+    return property(getter, doc=doc)
 
 
 class SimpleLinearRegression:
@@ -8,12 +128,27 @@ class SimpleLinearRegression:
     Класс для выполнения линейной регрессии по методологии из Excel
     """
     
+    # Результаты, которые строятся один раз после обучения и сбрасываются в fit()
+    _CACHED_RESULTS = ('equation_string', 'summary', 'interpretation')
+    
+    # Статистики коэффициентов (представления полей таблицы self.coefs)
+    slope = _coef_property(_SLOPE, 'value', "Коэффициент наклона (Beta1)")
+    intercept = _coef_property(_INTERCEPT, 'value', "Y-пересечение (Beta0)")
+    slope_std_error = _coef_property(_SLOPE, 'se', "Стандартная ошибка коэффициента наклона")
+    intercept_std_error = _coef_property(_INTERCEPT, 'se', "Стандартная ошибка Y-пересечения")
+    slope_t_stat = _coef_property(_SLOPE, 't', "t-статистика для коэффициента наклона")
+    intercept_t_stat = _coef_property(_INTERCEPT, 't', "t-статистика для Y-пересечения")
+    slope_p_value = _coef_property(_SLOPE, 'p', "P-значение для коэффициента наклона")
+    intercept_p_value = _coef_property(_INTERCEPT, 'p', "P-значение для Y-пересечения")
+    slope_confidence_interval = _interval_property(_SLOPE, "Доверительный интервал для коэффициента наклона")
+    intercept_confidence_interval = _interval_property(_INTERCEPT, "Доверительный интервал для Y-пересечения")
+    
     def __init__(self):
         """
         Инициализация модели линейной регрессии
         """
-        self.slope = None  # Коэффициент наклона (Beta1)
-        self.intercept = None  # Y-пересечение (Beta0)
+        self.is_fitted = False  # Признак обученной модели
+        self.coefs = None  # Таблица статистик коэффициентов (COEF_DTYPE)
         self.r_squared = None  # Коэффициент детерминации R²
         self.adjusted_r_squared = None  # Скорректированный R²
         self.multiple_r = None  # Коэффициент множественной корреляции R
@@ -24,16 +159,42 @@ class SimpleLinearRegression:
         self.sum_of_squares_total = None  # Общая сумма квадратов
         self.f_statistic = None  # F-статистика
         self.f_significance = None  # Значимость F
-        self.slope_std_error = None  # Стандартная ошибка коэффициента наклона
-        self.intercept_std_error = None  # Стандартная ошибка Y-пересечения
-        self.slope_t_stat = None  # t-статистика для коэффициента наклона
-        self.intercept_t_stat = None  # t-статистика для Y-пересечения
-        self.slope_p_value = None  # P-значение для коэффициента наклона
-        self.intercept_p_value = None  # P-значение для Y-пересечения
-        self.slope_confidence_interval = None  # Доверительный интервал для коэффициента наклона
-        self.intercept_confidence_interval = None  # Доверительный интервал для Y-пересечения
-        self.predictions = None  # Предсказанные значения
-        self.residuals = None  # Остатки
+        self._X = None  # Обучающие значения X (для ленивого расчета прогнозов)
+        self._y = None  # Обучающие значения y (для ленивого расчета остатков)
+    
+    def _coef_field(self, index, field):
+        """
+        Получение поля из таблицы коэффициентов
+        
+        Args:
+            index (int): Номер строки (_INTERCEPT или _SLOPE)
+            field (str): Имя поля COEF_DTYPE
+        
+        Returns:
+            float: Значение поля (NaN, если статистика не определена, например при постоянном X
+                или y) или None, если модель не обучена или статистики не вычислялись (n <= 2)
+        """
+        if not self.is_fitted or (field != 'value' and self.observations <= 2):
+            return None
+        return self.coefs[field][index]
+    
+    @property
+    def predictions(self):
+        """
+        Предсказанные значения на обучающей выборке (вычисляются по требованию)
+        """
+        if self._X is None:
+            return None
+        return self.intercept + self.slope * self._X
+    
+    @property
+    def residuals(self):
+        """
+        Остатки на обучающей выборке (вычисляются по требованию)
+        """
+        if self._X is None:
+            return None
+        return self._y - self.predictions
     
     def fit(self, X, y):
         """
@@ -47,39 +208,52 @@ class SimpleLinearRegression:
         if X.shape[0] != y.shape[0]:
             raise ValueError("Количество строк в X и y должно совпадать")
         
+        # Сбрасываем закэшированные результаты предыдущего обучения
+        for name in self._CACHED_RESULTS:
+            self.__dict__.pop(name, None)
+        
         # Сохраняем количество наблюдений
         self.observations = X.shape[0]
         
-        # Преобразуем X в одномерный массив, если его форма (n, 1)
-        if len(X.shape) > 1 and X.shape[1] == 1:
-            X = X.flatten()
+        # Копируем данные в непрерывные массивы float64: модель хранит их для прогнозов
+        # и остатков, и последующие изменения массивов вызывающего кода не должны их менять
+        X = np.array(X, dtype=np.float64, order='C')
+        y = np.array(y, dtype=np.float64, order='C')
+        
+        # Преобразуем X в одномерный массив, если его форма (n, 1) (ravel возвращает представление без копии)
+        if X.ndim > 1 and X.shape[1] == 1:
+            X = X.ravel()
         
-        # Вычисляем средние X и y
-        mean_x = np.mean(X)
-        mean_y = np.mean(y)
+        # Вычисляем средние X и y и суммы произведений отклонений от средних
+        mean_x, mean_y, Sxx, Sxy, Syy = _ols_moments(X, y)
         
         # Вычисляем коэффициенты регрессии по методу наименьших квадратов
-        # Формула для slope (Beta1): sum((X - mean_X) * (y - mean_y)) / sum((X - mean_X)^2)
-        numerator = np.sum((X - mean_x) * (y - mean_y))
-        denominator = np.sum((X - mean_x) ** 2)
-        self.slope = numerator / denominator
+        # Формула для slope (Beta1): Sxy / Sxx
+        slope = Sxy / Sxx
         
         # Формула для intercept (Beta0): mean_y - slope * mean_x
-        self.intercept = mean_y - self.slope * mean_x
+        intercept = mean_y - slope * mean_x
         
-        # Вычисляем предсказанные значения
-        self.predictions = self.intercept + self.slope * X
+        # Статистики коэффициентов заполняются ниже (при n > 2)
+        coefs = np.full(2, np.nan, dtype=COEF_DTYPE)
+        coefs['value'] = (intercept, slope)
+        self.coefs = coefs
+        self.is_fitted = True
         
-        # Вычисляем остатки
-        self.residuals = y - self.predictions
+        # Прогнозы и остатки вычисляются по требованию через свойства
+        self._X = X
+        self._y = y
         
-        # Вычисляем суммы квадратов
-        self.sum_of_squares_total = np.sum((y - mean_y) ** 2)  # SST
-        self.sum_of_squares_residual = np.sum(self.residuals ** 2)  # SSE
-        self.sum_of_squares_regression = self.sum_of_squares_total - self.sum_of_squares_residual  # SSR
+        # Вычисляем суммы квадратов без материализации массива остатков.
+        # Для простой регрессии из нормальных уравнений SSR = Beta1 * Sxy = Sxy² / Sxx,
+        # поэтому SSR не получается вычитанием близких величин SST - SSE.
+        # SSE ограничивается снизу нулем на случай ошибок округления при почти точной подгонке.
+        self.sum_of_squares_total = Syy  # SST
+        self.sum_of_squares_regression = slope * Sxy  # SSR
+        self.sum_of_squares_residual = np.maximum(Syy - self.sum_of_squares_regression, 0.0)  # SSE
         
-        # Вычисляем коэффициент детерминации R²
-        self.r_squared = 1 - (self.sum_of_squares_residual / self.sum_of_squares_total)
+        # Вычисляем коэффициент детерминации R² = SSR / SST (без вычитания из единицы)
+        self.r_squared = self.sum_of_squares_regression / self.sum_of_squares_total
         
         # Вычисляем скорректированный R²
         if self.observations > 2:  # для линейной регрессии: n - 2 (есть 2 параметра: slope и intercept)
@@ -88,7 +262,7 @@ class SimpleLinearRegression:
             self.adjusted_r_squared = None
         
         # Вычисляем коэффициент множественной корреляции R
-        self.multiple_r = np.sqrt(self.r_squared)
+        self.multiple_r = np.sqrt(np.maximum(self.r_squared, 0.0))
         
         # Вычисляем стандартную ошибку регрессии
         if self.observations > 2:
@@ -105,48 +279,27 @@ class SimpleLinearRegression:
             self.f_statistic = ms_regression / ms_residual
             
             # Вычисляем значимость F (p-value)
-            from scipy import stats
-            self.f_significance = 1 - stats.f.cdf(self.f_statistic, df_regression, df_residual)
+            stats = _get_stats()
+            self.f_significance = stats.f.sf(self.f_statistic, df_regression, df_residual)
         else:
             self.f_statistic = None
             self.f_significance = None
         
         # Вычисляем стандартные ошибки коэффициентов, t-статистики и p-значения
         if self.observations > 2:
-            # Стандартная ошибка для slope
-            self.slope_std_error = self.standard_error / np.sqrt(np.sum((X - mean_x) ** 2))
+            # Стандартные ошибки для intercept и slope
+            se = self.standard_error * np.sqrt(np.array([1/self.observations + (mean_x**2)/Sxx, 1/Sxx]))
             
-            # Стандартная ошибка для intercept
-            self.intercept_std_error = self.standard_error * np.sqrt(1/self.observations + (mean_x**2)/np.sum((X - mean_x)**2))
-            
-            # t-статистики
-            self.slope_t_stat = self.slope / self.slope_std_error
-            self.intercept_t_stat = self.intercept / self.intercept_std_error
-            
-            # p-значения
+            # t-статистики, p-значения и доверительные интервалы (95%) для обоих коэффициентов сразу
             df = self.observations - 2
-            self.slope_p_value = 2 * (1 - stats.t.cdf(abs(self.slope_t_stat), df))
-            self.intercept_p_value = 2 * (1 - stats.t.cdf(abs(self.intercept_t_stat), df))
+            t_stat = coefs['value'] / se
+            delta = _t_ppf_975(df) * se
             
-            # Доверительные интервалы (95%)
-            t_critical = stats.t.ppf(0.975, df)
-            self.slope_confidence_interval = (
-                self.slope - t_critical * self.slope_std_error,
-                self.slope + t_critical * self.slope_std_error
-            )
-            self.intercept_confidence_interval = (
-                self.intercept - t_critical * self.intercept_std_error,
-                self.intercept + t_critical * self.intercept_std_error
-            )
-        else:
-            self.slope_std_error = None
-            self.intercept_std_error = None
-            self.slope_t_stat = None
-            self.intercept_t_stat = None
-            self.slope_p_value = None
-            self.intercept_p_value = None
-            self.slope_confidence_interval = None
-            self.intercept_confidence_interval = None
+            coefs['se'] = se
+            coefs['t'] = t_stat
+            coefs['p'] = 2 * _get_stats().t.sf(np.abs(t_stat), df)
+            coefs['ci_lo'] = coefs['value'] - delta
+            coefs['ci_hi'] = coefs['value'] + delta
     
     def predict(self, X):
         """
@@ -158,15 +311,34 @@ class SimpleLinearRegression:
         Returns:
             numpy.ndarray: Предсказанные значения зависимой переменной
         """
-        if self.slope is None or self.intercept is None:
+        if not self.is_fitted:
             raise ValueError("Модель не обучена. Сначала вызовите метод fit().")
         
+        # Быстрый путь: одномерный непрерывный массив float64 (например, сетка для графика)
+        if X.ndim == 1 and X.dtype == np.float64 and X.flags.c_contiguous:
+            return self.intercept + self.slope * X
+        
         # Преобразуем X в одномерный массив, если его форма (n, 1)
         if len(X.shape) > 1 and X.shape[1] == 1:
-            X = X.flatten()
+            X = X.ravel()
         
         return self.intercept + self.slope * X
     
+    def predict_1d(self, x):
+        """
+        Предсказание значений без проверок входных данных
+        
+        Вызывающая сторона гарантирует, что модель обучена, а x - одномерный
+        массив float64 (например, сетка значений для построения линии регрессии).
+        
+        Args:
+            x (numpy.ndarray): Одномерный массив значений независимой переменной
+        
+        Returns:
+            numpy.ndarray: Предсказанные значения зависимой переменной
+        """
+        return self.intercept + self.slope * x
+    
     def get_equation_string(self):
         """
         Получение строкового представления уравнения регрессии
@@ -174,7 +346,14 @@ class SimpleLinearRegression:
         Returns:
             str: Строковое представление уравнения регрессии
         """
-        if self.slope is None or self.intercept is None:
+        return self.equation_string
+    
+    @cached_property
+    def equation_string(self):
+        """
+        Строковое представление уравнения регрессии (строится один раз после обучения)
+        """
+        if not self.is_fitted:
             return "Модель не обучена"
         
         sign = "+" if self.intercept >= 0 else ""
@@ -187,7 +366,14 @@ class SimpleLinearRegression:
         Returns:
             dict: Словарь со сводной статистикой
         """
-        if self.slope is None or self.intercept is None:
+        return self.summary
+    
+    @cached_property
+    def summary(self):
+        """
+        Сводная статистика регрессии (строится один раз после обучения)
+        """
+        if not self.is_fitted:
             return {"error": "Модель не обучена"}
         
         summary = {
@@ -217,22 +403,8 @@ class SimpleLinearRegression:
                 }
             },
             "Коэффициенты": {
-                "Y-пересечение": {
-                    "Коэффициент": self.intercept,
-                    "Стандартная ошибка": self.intercept_std_error,
-                    "t-статистика": self.intercept_t_stat,
-                    "P-Значение": self.intercept_p_value,
-                    "Нижние 95%": self.intercept_confidence_interval[0] if self.intercept_confidence_interval else None,
-                    "Верхние 95%": self.intercept_confidence_interval[1] if self.intercept_confidence_interval else None
-                },
-                "X": {
-                    "Коэффициент": self.slope,
-                    "Стандартная ошибка": self.slope_std_error,
-                    "t-статистика": self.slope_t_stat,
-                    "P-Значение": self.slope_p_value,
-                    "Нижние 95%": self.slope_confidence_interval[0] if self.slope_confidence_interval else None,
-                    "Верхние 95%": self.slope_confidence_interval[1] if self.slope_confidence_interval else None
-                }
+                name: {label: self._coef_field(index, field) for field, label in _COEF_SUMMARY_FIELDS}
+                for index, name in ((_INTERCEPT, "Y-пересечение"), (_SLOPE, "X"))
             }
         }
         
@@ -245,40 +417,67 @@ class SimpleLinearRegression:
         Returns:
             dict: Словарь с интерпретацией результатов
         """
-        if self.slope is None or self.intercept is None:
+        return self.interpretation
+    
+    @staticmethod
+    def _significance_text(p_value):
+        """
+        Текст о статистической значимости по p-значению
+        
+        Args:
+            p_value (float): P-значение, NaN или None
+        
+        Returns:
+            str: Текст о значимости
+        """
+        if p_value is None or np.isnan(p_value):
+            return "Статистическая значимость не может быть оценена."
+        return f"Статистически {'значимо' if p_value < 0.05 else 'незначимо'} (p-значение = {p_value:.6f})."
+    
+    @cached_property
+    def interpretation(self):
+        """
+        Интерпретация результатов регрессии (строится один раз после обучения)
+        """
+        if not self.is_fitted:
             return {"error": "Модель не обучена"}
         
+        # Уровень R² и знак наклона определяют формулировки выводов
+        sign = 1 if self.slope > 0 else -1
+        bucket = 2 if self.r_squared > 0.7 else 1 if self.r_squared > 0.5 else 0
+        
+        # F-статистика не вычисляется при n <= 2 и равна NaN при постоянных X или y
+        f_defined = self.f_significance is not None and not np.isnan(self.f_significance)
+        
         interpretation = {
-            "Уравнение регрессии": self.get_equation_string(),
+            "Уравнение регрессии": self.equation_string,
             "Интерпретация коэффициентов": {
                 "Y-пересечение": (
                     f"Значение {self.intercept:.6f} представляет ожидаемое значение Y, когда X равен 0. "
-                    f"Статистически {'значимо' if self.intercept_p_value < 0.05 else 'незначимо'} "
-                    f"(p-значение = {self.intercept_p_value:.6f})."
+                    + self._significance_text(self.intercept_p_value)
                 ),
                 "Коэффициент наклона": (
                     f"Значение {self.slope:.6f} показывает, что при увеличении X на 1 единицу, "
                     f"Y в среднем изменяется на {self.slope:.6f} единиц. "
-                    f"Статистически {'значимо' if self.slope_p_value < 0.05 else 'незначимо'} "
-                    f"(p-значение = {self.slope_p_value:.6f})."
+                    + self._significance_text(self.slope_p_value)
                 )
             },
             "Качество модели": {
                 "R-квадрат": (
                     f"Значение {self.r_squared:.6f} показывает, что {self.r_squared*100:.2f}% вариации в Y "
-                    f"объясняется моделью. Это говорит о {'высоком' if self.r_squared > 0.7 else 'среднем' if self.r_squared > 0.5 else 'низком'} "
+                    f"объясняется моделью. Это говорит о {_FIT_QUALITY[bucket]} "
                     f"качестве соответствия модели данным."
                 ),
                 "F-статистика": (
                     f"F-статистика равна {self.f_statistic:.6f} с p-значением {self.f_significance:.6f}, "
                     f"что {'подтверждает' if self.f_significance < 0.05 else 'не подтверждает'} "
                     f"статистическую значимость модели в целом."
-                )
+                ) if f_defined else "Значимость модели в целом не может быть оценена."
             },
             "Практические выводы": (
                 f"На основе данной модели можно сделать вывод, что между X и Y существует "
-                f"{'сильная положительная' if self.slope > 0 and self.r_squared > 0.7 else 'сильная отрицательная' if self.slope < 0 and self.r_squared > 0.7 else 'умеренная положительная' if self.slope > 0 and self.r_squared > 0.5 else 'умеренная отрицательная' if self.slope < 0 and self.r_squared > 0.5 else 'слабая положительная' if self.slope > 0 else 'слабая отрицательная'} "
-                f"линейная зависимость. Модель {'может' if self.r_squared > 0.5 else 'не может с высокой точностью'} "
+                f"{_STRENGTH[(sign, bucket)]} "
+                f"линейная зависимость. Модель {'может' if bucket > 0 else 'не может с высокой точностью'} "
                 f"быть использована для прогнозирования значений Y по значениям X."
             )
         }
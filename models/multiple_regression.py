@@ -1,7 +1,100 @@
+import logging
+import math
+from functools import lru_cache, cached_property
+
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score, mean_squared_error
-from scipy import stats
+from scipy import linalg
+from scipy.special import fdtrc, stdtr, stdtrit
+
+logger = logging.getLogger(__name__)
+
+
+def _fit_reductions(y, residuals):
+    """
+    Вычисление сумм квадратов и статистик остатков средствами numpy
+    
+    Args:
+        y (numpy.ndarray): Одномерный массив значений y
+        residuals (numpy.ndarray): Одномерный массив остатков
+    
+    Returns:
+        tuple: (mean_y, SST, SSE, residuals_min, residuals_max, residuals_mean, residuals_std)
+    """
+    mean_y = np.mean(y)
+    dy = y - mean_y
+    return (mean_y, np.dot(dy, dy), np.dot(residuals, residuals),
+            np.min(residuals), np.max(residuals), np.mean(residuals), np.std(residuals))
+
+
+# Порог мультиколлинеарности для доли независимой вариации переменной:
+# sqrt(1 - 0.95²) соответствует парной корреляции |r| > 0.95
+_COLLINEARITY_THRESHOLD = math.sqrt(1 - 0.95 ** 2)
+
+# Если в float32 отношение диагональных элементов R меньше этого порога, точности float32
+# не хватает для проверки ранга и ковариационной матрицы, и подгонка повторяется в float64
+_FLOAT32_MIN_DIAG_RATIO = math.sqrt(np.finfo(np.float32).eps)
+
+# При большем числе параметров QR-разложение на GPU уступает CPU
+_GPU_MAX_PARAMS = 4096
+
+# Модули cupy импортируются только при запросе device='cuda' (см. _get_cupy)
+_cupy = None
+_cupy_linalg = None
+
+
+def _get_cupy():
+    """
+    Ленивый импорт cupy для вычислений на GPU
+    
+    Returns:
+        tuple: (модуль cupy, модуль cupyx.scipy.linalg)
+    
+    Raises:
+        ImportError: Если cupy не установлен
+    """
+    global _cupy, _cupy_linalg
+    if _cupy is None:
+        try:
+            import cupy
+            import cupyx.scipy.linalg
+        except ImportError as e:
+            raise ImportError("Для вычислений на GPU (device='cuda') требуется пакет cupy") from e
+        _cupy = cupy
+        _cupy_linalg = cupyx.scipy.linalg
+    return _cupy, _cupy_linalg
+
+
+def _design_matrix(X, dtype):
+    """
+    Матрица X с добавленным столбцом единиц для интерсепта
+    
+    Матрица сразу создается в порядке Fortran, в котором с ней работает LAPACK,
+    поэтому QR-разложение может выполняться на месте без дополнительной копии.
+    
+    Args:
+        X (numpy.ndarray): Массив независимых переменных (n x p)
+        dtype (numpy.dtype): Тип данных матрицы
+    
+    Returns:
+        numpy.ndarray: Матрица размера n x (p + 1)
+    """
+    X_with_intercept = np.empty((X.shape[0], X.shape[1] + 1), dtype=dtype, order='F')
+    X_with_intercept[:, 0] = 1.0
+    X_with_intercept[:, 1:] = X
+    return X_with_intercept
+
+
+@lru_cache(maxsize=8)
+def _eye(k, dtype):
+    """
+    Единичная матрица k x k (кэшируется между вызовами fit)
+    
+    Returns:
+        numpy.ndarray: Единичная матрица, доступная только для чтения
+    """
+    identity = np.eye(k, dtype=dtype)
+    identity.flags.writeable = False
+    return identity
 
 
 class MultipleRegression:
@@ -9,6 +102,9 @@ class MultipleRegression:
     Класс для выполнения множественной регрессии по методологии из Excel
     """
     
+    # Результаты, которые строятся один раз после обучения и сбрасываются в fit()
+    _CACHED_RESULTS = ('equation_string', 'summary', 'interpretation')
+    
     def __init__(self):
         """
         Инициализация модели множественной регрессии
@@ -36,8 +132,10 @@ class MultipleRegression:
         self.predictions = None  # Предсказанные значения
         self.residuals = None  # Остатки
         self.feature_names = None  # Имена признаков
+        self.df_regression = None  # Степени свободы регрессии
+        self.df_residual = None  # Степени свободы остатка
     
-    def fit(self, X, y, feature_names=None):
+    def fit(self, X, y, feature_names=None, dtype=np.float64, device='cpu'):
         """
         Обучение модели множественной регрессии
         
@@ -45,11 +143,24 @@ class MultipleRegression:
             X (numpy.ndarray): Массив независимых переменных (предикторов)
             y (numpy.ndarray): Массив зависимой переменной (отклика)
             feature_names (list, optional): Список имен признаков. По умолчанию None.
+            dtype (numpy.dtype, optional): Тип данных для QR-разложения (float64 или float32).
+                float32 ускоряет разложение на очень больших выборках; статистики
+                в любом случае вычисляются в float64, а при плохой обусловленности
+                подгонка повторяется в float64. По умолчанию float64.
+            device (str, optional): 'cpu' или 'cuda'. При 'cuda' QR-разложение и проекция
+                выполняются на GPU средствами cupy. По умолчанию 'cpu'.
         """
+        if device not in ('cpu', 'cuda'):
+            raise ValueError("Параметр device должен быть 'cpu' или 'cuda'")
+        
         # Проверяем входные данные
         if X.shape[0] != y.shape[0]:
             raise ValueError("Количество строк в X и y должно совпадать")
         
+        # Сбрасываем закэшированные результаты предыдущего обучения
+        for name in self._CACHED_RESULTS:
+            self.__dict__.pop(name, None)
+        
         # Сохраняем количество наблюдений и количество признаков
         self.observations = X.shape[0]
         n_features = X.shape[1]
@@ -62,148 +173,237 @@ class MultipleRegression:
                 raise ValueError("Количество имен признаков должно совпадать с количеством столбцов в X")
             self.feature_names = feature_names
         
-        # Проверка на мультиколлинеарность
-        if n_features > 1:
-            correlation_matrix = np.corrcoef(X.T)
-            # Проверяем абсолютные значения корреляций (исключая диагональ)
-            off_diagonal_correlations = np.abs(correlation_matrix[np.triu_indices(n_features, k=1)])
-            high_correlations = off_diagonal_correlations > 0.95
+        # Приводим данные к нужному типу один раз; статистики считаются по y в float64
+        dtype = np.dtype(dtype)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        y_work = y if dtype == np.float64 else y.astype(dtype)
+        
+        # Формируем матрицу X с добавленным столбцом единиц для интерсепта
+        n_params = n_features + 1
+        X_with_intercept = _design_matrix(X, dtype)
+        
+        use_gpu = device == 'cuda' and n_params <= self.observations
+        if use_gpu and n_params > _GPU_MAX_PARAMS:
+            logger.info("Слишком много параметров (%d) для GPU, используется CPU", n_params)
+            use_gpu = False
+        
+        # Одно экономное QR-разложение дает и коэффициенты, и (X^T X)^(-1),
+        # без формирования и обращения матрицы X^T X
+        if use_gpu:
+            # Одна передача X и y на GPU; обратно копируются R, beta и предсказания
+            cp, cp_linalg = _get_cupy()
+            Q_gpu, R_gpu = cp.linalg.qr(cp.asarray(X_with_intercept))
+            Qty_gpu = Q_gpu.T @ cp.asarray(y_work)
+            R = cp.asnumpy(R_gpu)
+            gpu_beta = cp.asnumpy(cp_linalg.solve_triangular(R_gpu, Qty_gpu))
+            gpu_predictions = cp.asnumpy(Q_gpu @ Qty_gpu)
+            del Q_gpu, R_gpu, Qty_gpu
+        else:
+            # Разложение выполняется на месте: матрица X_with_intercept - наша собственная копия
+            Q, R = linalg.qr(X_with_intercept, mode='economic', overwrite_a=True, check_finite=False)
+            X_with_intercept = None
+        
+        r_diag = np.abs(np.diag(R))
+        
+        # Порог ранга float32 (n * eps ~ 1% при n = 1e5) отбрасывал бы хорошо обусловленные
+        # столбцы малого масштаба, поэтому ранг проверяется только для разложения в float64
+        if dtype != np.float64 and (self.observations < n_params
+                                    or r_diag.min() <= r_diag.max() * _FLOAT32_MIN_DIAG_RATIO):
+            logger.info("Матрица X плохо обусловлена для float32, подгонка повторяется в float64")
+            return self.fit(X, y, feature_names=feature_names, dtype=np.float64, device=device)
+        
+        # Проверяем ранг по диагонали R (порог как в np.linalg.matrix_rank)
+        rank_tol = max(self.observations, n_params) * np.finfo(np.float64).eps
+        rank_deficient = self.observations < n_params or r_diag.min() <= r_diag.max() * rank_tol
+        
+        # Проверка на мультиколлинеарность по диагонали R: |R_jj| - норма части столбца j,
+        # не объясняемой интерсептом и предыдущими переменными. Отношение к норме
+        # центрированного столбца равно sqrt(1 - R²_j); порог соответствует |r| > 0.95
+        if n_features > 1 and not self.observations < n_params:
+            centered_norms = np.sqrt(self.observations) * np.std(X, axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                independent_share = r_diag[1:] / centered_norms
+            collinear = independent_share < _COLLINEARITY_THRESHOLD
             
-            if np.any(high_correlations):
-                print(f"ПРЕДУПРЕЖДЕНИЕ: Обнаружена высокая корреляция между переменными:")
-                for i, j in zip(*np.triu_indices(n_features, k=1)):
-                    if abs(correlation_matrix[i, j]) > 0.95:
-                        print(f"  {self.feature_names[i]} и {self.feature_names[j]}: {correlation_matrix[i, j]:.4f}")
-        
-        # Используем LinearRegression из scikit-learn для вычисления коэффициентов
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        self.coefficients = model.coef_
-        self.intercept = model.intercept_
+            if np.any(collinear):
+                logger.warning("Обнаружена мультиколлинеарность: переменные почти линейно выражаются "
+                               "через предыдущие (доля независимой вариации):")
+                for j in np.flatnonzero(collinear):
+                    logger.warning("  %s: %.4f", self.feature_names[j], independent_share[j])
+        
+        # При полном ранге все коэффициенты идентифицируемы
+        rank = n_params
+        identifiable = None
+        
+        if rank_deficient:
+            if X_with_intercept is None:
+                X_with_intercept = _design_matrix(X, dtype)
+            
+            # При неполном ранге используем МНК на основе QR-разложения с выбором ведущего столбца;
+            # порог cond тот же, что при проверке ранга и в pinv, иначе gelsy определит ранг
+            # по своему, гораздо меньшему порогу и вернет огромные коэффициенты
+            beta, _, rank, _ = linalg.lstsq(X_with_intercept, y_work, cond=rank_tol,
+                                            lapack_driver='gelsy', check_finite=False)
+            
+            # Так как X^T X = R^T R, псевдообратная (X^T X)^+ = R^+ R^(+T):
+            # матрица Грама не формируется, и число обусловленности не возводится в квадрат
+            R_inv = np.linalg.pinv(R.astype(np.float64), rcond=rank_tol)
+            
+            # Коэффициент j идентифицируем, если e_j лежит в пространстве строк X,
+            # то есть диагональный элемент проектора R^+ R равен единице
+            projection_diag = np.einsum('ij,ji->i', R_inv, R)
+            identifiable = np.abs(projection_diag - 1) < np.sqrt(np.finfo(np.float64).eps)
+            
+            # Вычисляем предсказанные значения
+            predictions = X_with_intercept @ beta
+        elif use_gpu:
+            # Ковариационная матрица (p x p) считается на CPU
+            beta, predictions = gpu_beta, gpu_predictions
+            R_inv = linalg.solve_triangular(R.astype(np.float64, copy=False), _eye(n_params, np.float64),
+                                            check_finite=False)
+        else:
+            Qty = Q.T @ y_work
+            beta = linalg.solve_triangular(R, Qty, check_finite=False)
+            R_inv = linalg.solve_triangular(R.astype(np.float64, copy=False), _eye(n_params, np.float64),
+                                            check_finite=False)
+            
+            # Предсказанные значения - проекция y на столбцы Q
+            predictions = Q @ Qty
         
-        # Вычисляем предсказанные значения
-        self.predictions = model.predict(X)
+        self.predictions = predictions.astype(np.float64, copy=False)
+        beta = beta.astype(np.float64, copy=False)
+        self.intercept = beta[0]
+        self.coefficients = beta[1:]
         
         # Вычисляем остатки
         self.residuals = y - self.predictions
         
-        # Вычисляем средние значения
-        mean_y = np.mean(y)
+        # Вычисляем среднее, суммы квадратов и статистики остатков
+        mean_y, sst, sse, residuals_min, residuals_max, residuals_mean, residuals_std = _fit_reductions(
+            y, self.residuals)
         
         # Вычисляем суммы квадратов
-        self.sum_of_squares_total = np.sum((y - mean_y) ** 2)  # SST
-        self.sum_of_squares_residual = np.sum(self.residuals ** 2)  # SSE
+        self.sum_of_squares_total = sst  # SST
+        self.sum_of_squares_residual = sse  # SSE
         self.sum_of_squares_regression = self.sum_of_squares_total - self.sum_of_squares_residual  # SSR
         
         # Отладочная информация для сумм квадратов
-        print(f"DEBUG Суммы квадратов:")
-        print(f"  mean_y = {mean_y}")
-        print(f"  sum_of_squares_total = {self.sum_of_squares_total}")
-        print(f"  sum_of_squares_residual = {self.sum_of_squares_residual}")
-        print(f"  sum_of_squares_regression = {self.sum_of_squares_regression}")
-        print(f"  residuals_min = {np.min(self.residuals)}")
-        print(f"  residuals_max = {np.max(self.residuals)}")
-        print(f"  residuals_mean = {np.mean(self.residuals)}")
-        print(f"  residuals_std = {np.std(self.residuals)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Суммы квадратов:\n"
+                f"  mean_y = {mean_y}\n"
+                f"  sum_of_squares_total = {self.sum_of_squares_total}\n"
+                f"  sum_of_squares_residual = {self.sum_of_squares_residual}\n"
+                f"  sum_of_squares_regression = {self.sum_of_squares_regression}\n"
+                f"  residuals_min = {residuals_min}\n"
+                f"  residuals_max = {residuals_max}\n"
+                f"  residuals_mean = {residuals_mean}\n"
+                f"  residuals_std = {residuals_std}"
+            )
+        
+        # Степени свободы: при неполном ранге уменьшаются на дефект ранга
+        self.df_regression = rank - 1
+        self.df_residual = self.observations - rank
+        df_regression = self.df_regression
+        df_residual = self.df_residual
+        
+        # При постоянном y (SST = 0 с точностью до округления среднего) R² и F не определены
+        eps = np.finfo(np.float64).eps
+        y_is_constant = self.sum_of_squares_total <= self.observations * (self.observations * eps * mean_y) ** 2
         
         # Вычисляем коэффициент детерминации R²
-        self.r_squared = 1 - (self.sum_of_squares_residual / self.sum_of_squares_total)
+        if y_is_constant:
+            self.r_squared = np.nan
+        else:
+            self.r_squared = 1 - (self.sum_of_squares_residual / self.sum_of_squares_total)
         
         # Вычисляем скорректированный R²
-        if self.observations > n_features + 1:
-            self.adjusted_r_squared = 1 - ((1 - self.r_squared) * (self.observations - 1) / (self.observations - n_features - 1))
+        if df_residual > 0:
+            self.adjusted_r_squared = 1 - ((1 - self.r_squared) * (self.observations - 1) / df_residual)
         else:
             self.adjusted_r_squared = None
         
         # Вычисляем коэффициент множественной корреляции R
-        self.multiple_r = np.sqrt(self.r_squared)
+        self.multiple_r = math.sqrt(max(self.r_squared, 0.0))
         
         # Вычисляем стандартную ошибку регрессии
-        if self.observations > n_features + 1:
-            self.standard_error = np.sqrt(self.sum_of_squares_residual / (self.observations - n_features - 1))
+        if df_residual > 0:
+            self.standard_error = math.sqrt(self.sum_of_squares_residual / df_residual)
         else:
             self.standard_error = None
         
         # Вычисляем F-статистику
-        if self.observations > n_features + 1:
-            df_regression = n_features
-            df_residual = self.observations - n_features - 1
+        if df_residual > 0 and df_regression > 0:
             ms_regression = self.sum_of_squares_regression / df_regression
             ms_residual = self.sum_of_squares_residual / df_residual
-            self.f_statistic = ms_regression / ms_residual
+            self.f_statistic = np.nan if y_is_constant else ms_regression / ms_residual
             
             # Вычисляем значимость F (p-value)
-            # Используем survival function для более точных результатов с очень большими F-статистиками
-            self.f_significance = stats.f.sf(self.f_statistic, df_regression, df_residual)
+            # Используем дополнение функции распределения Фишера для более точных результатов с очень большими F-статистиками
+            self.f_significance = fdtrc(df_regression, df_residual, self.f_statistic)
             
-            # Проверка на числовую стабильность
-            if np.isnan(self.f_significance) or np.isinf(self.f_significance):
-                print(f"ПРЕДУПРЕЖДЕНИЕ: Проблема с числовой стабильностью F-статистики")
-                print(f"  f_statistic = {self.f_statistic}")
-                print(f"  df_regression = {df_regression}")
-                print(f"  df_residual = {df_residual}")
+            # Проверка на числовую стабильность (для постоянного y значимость F остается NaN)
+            if not math.isfinite(self.f_significance) and not y_is_constant:
+                logger.warning("Проблема с числовой стабильностью F-статистики: "
+                               "f_statistic = %s, df_regression = %s, df_residual = %s",
+                               self.f_statistic, df_regression, df_residual)
                 # Устанавливаем минимальное значение
                 self.f_significance = 1e-10
             elif self.f_significance < 1e-10:
-                print(f"ПРЕДУПРЕЖДЕНИЕ: Очень маленькое p-значение F-статистики: {self.f_significance}")
+                logger.debug("Очень маленькое p-значение F-статистики: %s", self.f_significance)
                 # Ограничиваем минимальное значение для стабильности
                 self.f_significance = 1e-10
             
             # Отладочная информация
-            print(f"DEBUG F-статистика:")
-            print(f"  df_regression = {df_regression}")
-            print(f"  df_residual = {df_residual}")
-            print(f"  sum_of_squares_regression = {self.sum_of_squares_regression}")
-            print(f"  sum_of_squares_residual = {self.sum_of_squares_residual}")
-            print(f"  ms_regression = {ms_regression}")
-            print(f"  ms_residual = {ms_residual}")
-            print(f"  f_statistic = {self.f_statistic}")
-            print(f"  f_significance = {self.f_significance}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "F-статистика:\n"
+                    f"  df_regression = {df_regression}\n"
+                    f"  df_residual = {df_residual}\n"
+                    f"  sum_of_squares_regression = {self.sum_of_squares_regression}\n"
+                    f"  sum_of_squares_residual = {self.sum_of_squares_residual}\n"
+                    f"  ms_regression = {ms_regression}\n"
+                    f"  ms_residual = {ms_residual}\n"
+                    f"  f_statistic = {self.f_statistic}\n"
+                    f"  f_significance = {self.f_significance}"
+                )
         else:
             self.f_statistic = None
             self.f_significance = None
         
         # Вычисляем стандартные ошибки коэффициентов, t-статистики и p-значения
-        if self.observations > n_features + 1:
-            # Формируем матрицу X с добавленным столбцом единиц для интерсепта
-            X_with_intercept = np.column_stack((np.ones(self.observations), X))
-            
-            # Вычисляем матрицу (X^T X)^(-1)
-            X_transpose_X = np.dot(X_with_intercept.T, X_with_intercept)
-            try:
-                X_transpose_X_inv = np.linalg.inv(X_transpose_X)
-            except np.linalg.LinAlgError:
-                # Если матрица сингулярная, используем псевдоинверсию
-                X_transpose_X_inv = np.linalg.pinv(X_transpose_X)
+        if df_residual > 0:
+            # Диагональ матрицы (X^T X)^(-1) = R^(-1) R^(-T) - квадраты норм строк R^(-1),
+            # сама матрица не формируется
+            X_transpose_X_inv_diag = np.einsum('ij,ij->i', R_inv, R_inv)
             
             # Вычисляем стандартные ошибки коэффициентов
             mse = self.sum_of_squares_residual / df_residual
-            var_coef = np.diag(X_transpose_X_inv) * mse
+            var_coef = X_transpose_X_inv_diag * mse
             std_errors = np.sqrt(var_coef)
+            if identifiable is not None:
+                # Для неидентифицируемых коэффициентов стандартная ошибка не определена
+                std_errors[~identifiable] = np.nan
+            
+            # t-статистики, p-значения и доверительные интервалы (95%) считаются
+            # одним векторным выражением для Y-пересечения и коэффициентов
+            t_stats = beta / std_errors
+            # Хвост распределения считается напрямую, без вычитания из единицы: 2 * stdtr(df, -|t|)
+            p_values = np.abs(t_stats)
+            np.negative(p_values, out=p_values)
+            stdtr(df_residual, p_values, out=p_values)
+            p_values *= 2
+            delta = stdtrit(df_residual, 0.975) * std_errors
+            confidence_intervals = np.stack([beta - delta, beta + delta], axis=1)
             
             self.intercept_std_error = std_errors[0]
             self.coef_std_errors = std_errors[1:]
-            
-            # Вычисляем t-статистики
-            self.intercept_t_stat = self.intercept / self.intercept_std_error
-            self.coef_t_stats = self.coefficients / self.coef_std_errors
-            
-            # Вычисляем p-значения
-            df = self.observations - n_features - 1
-            self.intercept_p_value = 2 * (1 - stats.t.cdf(abs(self.intercept_t_stat), df))
-            self.coef_p_values = 2 * (1 - stats.t.cdf(abs(self.coef_t_stats), df))
-            
-            # Вычисляем доверительные интервалы (95%)
-            t_critical = stats.t.ppf(0.975, df)
-            self.intercept_confidence_interval = (
-                self.intercept - t_critical * self.intercept_std_error,
-                self.intercept + t_critical * self.intercept_std_error
-            )
-            self.coef_confidence_intervals = [
-                (coef - t_critical * std_err, coef + t_critical * std_err)
-                for coef, std_err in zip(self.coefficients, self.coef_std_errors)
-            ]
+            self.intercept_t_stat = t_stats[0]
+            self.coef_t_stats = t_stats[1:]
+            self.intercept_p_value = p_values[0]
+            self.coef_p_values = p_values[1:]
+            self.intercept_confidence_interval = tuple(confidence_intervals[0])
+            self.coef_confidence_intervals = confidence_intervals[1:]
         else:
             self.intercept_std_error = None
             self.coef_std_errors = None
@@ -236,6 +436,13 @@ class MultipleRegression:
         Returns:
             str: Строковое представление уравнения регрессии
         """
+        return self.equation_string
+    
+    @cached_property
+    def equation_string(self):
+        """
+        Строковое представление уравнения регрессии (строится один раз после обучения)
+        """
         if self.coefficients is None or self.intercept is None:
             return "Модель не обучена"
         
@@ -254,11 +461,16 @@ class MultipleRegression:
         Returns:
             dict: Словарь со сводной статистикой
         """
+        return self.summary
+    
+    @cached_property
+    def summary(self):
+        """
+        Сводная статистика регрессии (строится один раз после обучения)
+        """
         if self.coefficients is None or self.intercept is None:
             return {"error": "Модель не обучена"}
         
-        n_features = len(self.coefficients)
-        
         summary = {
             "Регрессионная статистика": {
                 "Множественный R": self.multiple_r,
@@ -269,16 +481,16 @@ class MultipleRegression:
             },
             "Дисперсионный анализ": {
                 "Регрессия": {
-                    "df": n_features,
+                    "df": self.df_regression,
                     "SS": self.sum_of_squares_regression,
-                    "MS": self.sum_of_squares_regression / n_features,
+                    "MS": self.sum_of_squares_regression / self.df_regression,
                     "F": self.f_statistic,
                     "Значимость F": self.f_significance
                 },
                 "Остаток": {
-                    "df": self.observations - n_features - 1,
+                    "df": self.df_residual,
                     "SS": self.sum_of_squares_residual,
-                    "MS": self.sum_of_squares_residual / (self.observations - n_features - 1)
+                    "MS": self.sum_of_squares_residual / self.df_residual
                 },
                 "Итого": {
                     "df": self.observations - 1,
@@ -304,8 +516,8 @@ class MultipleRegression:
                 "Стандартная ошибка": self.coef_std_errors[i] if self.coef_std_errors is not None else None,
                 "t-статистика": self.coef_t_stats[i] if self.coef_t_stats is not None else None,
                 "P-Значение": self.coef_p_values[i] if self.coef_p_values is not None else None,
-                "Нижние 95%": self.coef_confidence_intervals[i][0] if self.coef_confidence_intervals else None,
-                "Верхние 95%": self.coef_confidence_intervals[i][1] if self.coef_confidence_intervals else None
+                "Нижние 95%": self.coef_confidence_intervals[i, 0] if self.coef_confidence_intervals is not None else None,
+                "Верхние 95%": self.coef_confidence_intervals[i, 1] if self.coef_confidence_intervals is not None else None
             }
         
         
@@ -318,11 +530,40 @@ class MultipleRegression:
         Returns:
             dict: Словарь с интерпретацией результатов
         """
+        return self.interpretation
+    
+    @staticmethod
+    def _feature_interpretation(feature_name, coef, p_value):
+        """
+        Текст интерпретации коэффициента одной переменной
+        
+        Args:
+            feature_name (str): Имя переменной
+            coef (float): Коэффициент переменной
+            p_value (float): P-значение коэффициента или None
+        
+        Returns:
+            str: Текст интерпретации
+        """
+        text = (
+            f"Коэффициент {coef:.6f} показывает, что при увеличении {feature_name} на 1 единицу "
+            f"(при фиксированных значениях других переменных), Y в среднем изменяется на {coef:.6f} единиц. "
+        )
+        if p_value is not None and not math.isnan(p_value):
+            significance = "значимо" if p_value < 0.05 else "незначимо"
+            return text + f"Статистически {significance} (p-значение = {p_value:.6f})."
+        return text + "Статистическая значимость не может быть оценена."
+    
+    @cached_property
+    def interpretation(self):
+        """
+        Интерпретация результатов множественной регрессии (строится один раз после обучения)
+        """
         if self.coefficients is None or self.intercept is None:
             return {"error": "Модель не обучена"}
         
         interpretation = {
-            "Уравнение регрессии": self.get_equation_string(),
+            "Уравнение регрессии": self.equation_string,
             "Интерпретация коэффициентов": {
                 "Y-пересечение": (
                     f"Значение {self.intercept:.6f} представляет ожидаемое значение Y, когда все X равны 0. "
@@ -346,27 +587,14 @@ class MultipleRegression:
                     f"статистическую значимость модели в целом."
                 )
             },
-            "Значимость переменных": {}
-        }
-        
-        # Добавляем интерпретацию для каждой переменной
-        for i, feature_name in enumerate(self.feature_names):
-            coef = self.coefficients[i]
-            p_value = self.coef_p_values[i] if self.coef_p_values is not None else None
-            
-            if p_value is not None:
-                significance = "значимо" if p_value < 0.05 else "незначимо"
-                interpretation["Значимость переменных"][feature_name] = (
-                    f"Коэффициент {coef:.6f} показывает, что при увеличении {feature_name} на 1 единицу "
-                    f"(при фиксированных значениях других переменных), Y в среднем изменяется на {coef:.6f} единиц. "
-                    f"Статистически {significance} (p-значение = {p_value:.6f})."
-                )
-            else:
-                interpretation["Значимость переменных"][feature_name] = (
-                    f"Коэффициент {coef:.6f} показывает, что при увеличении {feature_name} на 1 единицу "
-                    f"(при фиксированных значениях других переменных), Y в среднем изменяется на {coef:.6f} единиц. "
-                    f"Статистическая значимость не может быть оценена."
+            "Значимость переменных": {
+                feature_name: self._feature_interpretation(
+                    feature_name, self.coefficients[i],
+                    self.coef_p_values[i] if self.coef_p_values is not None else None
                 )
+                for i, feature_name in enumerate(self.feature_names)
+            }
+        }
         
         # Добавляем общий вывод
         interpretation["Практические выводы"] = (
@@ -7,96 +7,353 @@ from PyQt5.QtCore import QDateTime, Qt
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, Image, PageBreak
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.utils import ImageReader
 import os
-import tempfile
 from io import BytesIO
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+import logging
 import sys
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image as PILImage
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Путь к шрифтам (работает и в Python, и в EXE)
+if hasattr(sys, '_MEIPASS'):
+    # Если запущено из EXE (PyInstaller)
+    BASE_PATH = sys._MEIPASS
+else:
+    # Если запущено из Python
+    BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+FONTS_DIR = os.path.join(BASE_PATH, 'fonts')
+# Подмножества DejaVuSans (латиница, греческий, кириллица, пунктуация и
+# типографские символы) разбираются reportlab в несколько раз быстрее полных
+# шрифтов; как их пересобрать, описано в build_instructions.md
+FONT_PATH = os.path.join(FONTS_DIR, 'DejaVuSans-ru.ttf')
+BOLD_FONT_PATH = os.path.join(FONTS_DIR, 'DejaVuSans-Bold-ru.ttf')
+
+# Размер графика в отчете (в пунктах PDF)
+IMAGE_WIDTH = 500
+IMAGE_HEIGHT = 350
+
+# Количество пикселей растра на один пункт PDF: достаточно для четкой печати
+PIXELS_PER_POINT = 2
+
+# Начиная с этого числа строк таблица коэффициентов строится как LongTable,
+# которая быстрее разбивается на страницы
+LONG_TABLE_MIN_ROWS = 20
+
+# Параметры сохранения графиков по форматам: JPEG меньше и быстрее кодируется,
+# PNG сохраняет тонкие линии без артефактов сжатия. Несжатый TIFF - те же пиксели,
+# что и PNG, но без затрат на сжатие и распаковку: reportlab все равно заново
+# сжимает пиксели при встраивании в PDF, поэтому размер отчета не меняется
+FIGURE_SAVE_OPTIONS = {
+    'jpeg': {'quality': 85, 'optimize': False},
+    'png': {'optimize': False, 'compress_level': 1},
+    'tiff': {'compression': None},
+}
+
+# Таблицы замены для форматирования чисел: десятичная запятая и научная нотация
+_COMMA_TBL = str.maketrans('.', ',')
+_SCI_TBL = str.maketrans({'.': ',', 'e': '×10^'})
+
+def _fmt4(value, missing="Н/Д"):
+    """Число с 4 знаками после запятой (десятичный разделитель - запятая)"""
+    return f"{value:.4f}".translate(_COMMA_TBL) if isinstance(value, (int, float)) else missing
+
+def _fmt2(value, missing="Н/Д"):
+    """Число с 2 знаками после запятой (десятичный разделитель - запятая)"""
+    return f"{value:.2f}".translate(_COMMA_TBL) if isinstance(value, (int, float)) else missing
+
+def _fmt_int(value, missing="Н/Д"):
+    """Целое число"""
+    return str(int(value)) if isinstance(value, (int, float)) else missing
+
+def _fmt_p(value, missing="Н/Д"):
+    """P-значение: очень маленькие значения выводятся как верхняя граница"""
+    if not isinstance(value, (int, float)):
+        return missing
+    if value < 1e-10:
+        return "<1,0×10⁻¹⁰"
+    if value < 0.0001:
+        return "<0,0001"
+    return _fmt4(value)
+
+def _fmt_ss(value, missing="Н/Д"):
+    """Сумма квадратов: для больших значений используется научная нотация"""
+    if isinstance(value, (int, float)) and abs(value) > 1000000:
+        return f"{value:.2e}".translate(_SCI_TBL)
+    return _fmt2(value, missing)
+
+# Форматирование столбцов таблиц дисперсионного анализа и коэффициентов
+ANOVA_FORMATTERS = {"df": _fmt_int, "SS": _fmt_ss, "MS": _fmt2, "F": _fmt4, "Значимость F": _fmt_p}
+COEFFICIENT_FORMATTERS = {
+    "Коэффициент": _fmt4,
+    "Стандартная ошибка": _fmt4,
+    "t-статистика": _fmt4,
+    "P-Значение": _fmt_p,
+    "Нижние 95%": _fmt4,
+    "Верхние 95%": _fmt4,
+}
+
+# Заголовки (с переносом строк), строки и ширины колонок таблиц отчета
+REGRESSION_COL_WIDTHS = (300, 150)
+ANOVA_HEADERS = ("Источник", "df", "SS", "MS", "F", "Значимость\nF")
+ANOVA_ROWS = ("Регрессия", "Остаток", "Итого")
+# Увеличенная ширина колонки SS и других колонок
+ANOVA_COL_WIDTHS = (150, 80, 140, 120, 100, 120)
+COEFFICIENT_HEADERS = (
+    "Переменная",
+    "Коэффициент",
+    "Стд.\nошибка",
+    "t-стат",
+    "P-Значение",
+    "Нижние\n95%",
+    "Верхние\n95%",
+)
+# Первая колонка (Переменная) шире для длинных названий, остальные шесть
+# равномерно делят оставшуюся ширину альбомной страницы (750 пунктов)
+COEFFICIENT_COL_WIDTHS = (200,) + ((750 - 200) // 6,) * 6
+
+# Названия разделов отчета для отладочных сообщений
+SECTION_TITLES = {
+    'equation': "Уравнение",
+    'statistics': "Статистика",
+    'interpretation': "Интерпретация",
+    'figures': "Графики",
+}
+
+def _render_figure(figure, dpi):
+    """
+    Растеризует figure на отдельном холсте Agg и обрезает поля, как savefig(bbox_inches='tight')
+    
+    В отличие от savefig с bbox_inches='tight', график рисуется один раз: границы
+    содержимого берутся из уже нарисованного холста, а изображение обрезается.
+    Холст Qt (и его кэшированный рендерер для экрана) остается нетронутым.
+    
+    Args:
+        figure: matplotlib Figure
+        dpi (int): Разрешение растра
+    
+    Returns:
+        PIL.Image.Image: Изображение RGBA
+    """
+    screen_canvas = figure.canvas
+    screen_dpi = figure.dpi
+    canvas = FigureCanvasAgg(figure)
+    try:
+        figure.dpi = dpi
+        canvas.draw()
+        bbox = figure.get_tightbbox(canvas.get_renderer()).padded(matplotlib.rcParams['savefig.pad_inches'])
+        pixels = canvas.buffer_rgba()
+        height, width = pixels.shape[:2]
+        image = PILImage.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
+        
+        # Границы содержимого в пикселях (ось y растра направлена вниз); каждая граница
+        # ограничивается холстом отдельно, так как содержимое за пределами figure обрезается
+        left = max(0, round(bbox.x0 * dpi))
+        top = max(0, round(height - bbox.y1 * dpi))
+        right = min(width, round(bbox.x1 * dpi))
+        bottom = min(height, round(height - bbox.y0 * dpi))
+        return image.crop((left, top, right, bottom))
+    finally:
+        figure.dpi = screen_dpi
+        figure.set_canvas(screen_canvas)
+
+@lru_cache(maxsize=256)
+def _wrap_variable_name(key):
+    """Добавляет перенос строк для длинных названий переменных (результат кэшируется между отчетами)"""
+    if len(key) <= 15:
+        return key
+    
+    # Разбиваем длинные названия на несколько строк
+    words = key.split()
+    if len(words) > 2:
+        # Если больше 2 слов, разбиваем на строки по 2 слова
+        return '\n'.join(' '.join(words[i:i+2]) for i in range(0, len(words), 2))
+    
+    if len(key) > 25 and ' ' in key:
+        # Если название очень длинное, разбиваем по пробелам на части примерно по 15 символов
+        wrapped_key = []
+        current_line = ""
+        for part in key.split(' '):
+            if len(current_line + part) <= 15:
+                current_line += (part + " ")
+            else:
+                if current_line:
+                    wrapped_key.append(current_line.strip())
+                current_line = part + " "
+        if current_line:
+            wrapped_key.append(current_line.strip())
+        return '\n'.join(wrapped_key)
+    
+    return key
+
+class _ReaderImage(Image):
+    """Image для уже декодированного ImageReader: пиксели не декодируются повторно"""
+    
+    def __init__(self, reader, width=None, height=None):
+        # Image берет изображение из атрибута _img и создает ImageReader
+        # из файла, только если этот атрибут не задан
+        self._img = reader
+        super().__init__(reader.fp, width=width, height=height)
 
 class ReportGenerator:
-    def __init__(self):
-        # Регистрируем шрифты из папки fonts
+    # Шрифты регистрируются в reportlab один раз на процесс; после неудачной
+    # попытки повтор не выполняется, отчеты используют встроенные шрифты
+    _FONTS_REGISTERED = False
+    
+    # Встроенные шрифты используются, если DejaVu зарегистрировать не удалось
+    FONT_NAME = 'Times-Roman'
+    FONT_NAME_BOLD = 'Times-Bold'
+    
+    @classmethod
+    def _register_fonts(cls):
+        """Регистрирует шрифты из папки fonts (только при первом вызове)"""
+        if cls._FONTS_REGISTERED:
+            return
+        
         try:
-            # Получаем путь к шрифтам (работает и в Python, и в EXE)
-            if hasattr(sys, '_MEIPASS'):
-                # Если запущено из EXE (PyInstaller)
-                base_path = sys._MEIPASS
-            else:
-                # Если запущено из Python
-                base_path = os.path.dirname(os.path.abspath(__file__))
-            
-            fonts_dir = os.path.join(base_path, 'fonts')
-            
-            print(f"Базовый путь: {base_path}")
-            print(f"Директория со шрифтами: {fonts_dir}")
-            
-            # Проверяем существование файлов шрифтов
-            font_path = os.path.join(fonts_dir, 'DejaVuSans.ttf')
-            bold_font_path = os.path.join(fonts_dir, 'DejaVuSans-Bold.ttf')
-            
-            print(f"Путь к обычному шрифту: {font_path}")
-            print(f"Путь к жирному шрифту: {bold_font_path}")
-            
-            if not os.path.exists(font_path):
-                raise FileNotFoundError(f"Файл шрифта не найден: {font_path}")
-            if not os.path.exists(bold_font_path):
-                raise FileNotFoundError(f"Файл шрифта не найден: {bold_font_path}")
+            # Шрифты могли быть зарегистрированы в reportlab раньше (например,
+            # при повторной загрузке модуля) - тогда TTF повторно не разбираются
+            registered = pdfmetrics.getRegisteredFontNames()
+            if 'DejaVuSans' not in registered or 'DejaVuSans-Bold' not in registered:
+                # Проверяем существование файлов шрифтов
+                if not os.path.exists(FONT_PATH):
+                    raise FileNotFoundError(f"Файл шрифта не найден: {FONT_PATH}")
+                if not os.path.exists(BOLD_FONT_PATH):
+                    raise FileNotFoundError(f"Файл шрифта не найден: {BOLD_FONT_PATH}")
+                
+                # Регистрируем шрифты
+                pdfmetrics.registerFont(TTFont('DejaVuSans', FONT_PATH))
+                pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', BOLD_FONT_PATH))
             
-            # Регистрируем шрифты
-            pdfmetrics.registerFont(TTFont('DejaVuSans', font_path))
-            pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', bold_font_path))
+            # Семейство шрифтов: тег <b> в тексте абзацев выбирает полужирный вариант
+            pdfmetrics.registerFontFamily('DejaVuSans', normal='DejaVuSans', bold='DejaVuSans-Bold',
+                                          italic='DejaVuSans', boldItalic='DejaVuSans-Bold')
             
-            print("Шрифты успешно зарегистрированы")
-            self.FONT_NAME = 'DejaVuSans'
-            self.FONT_NAME_BOLD = 'DejaVuSans-Bold'
+            cls.FONT_NAME = 'DejaVuSans'
+            cls.FONT_NAME_BOLD = 'DejaVuSans-Bold'
             
         except Exception as e:
-            print(f"Ошибка при регистрации шрифтов: {str(e)}")
-            print("Трассировка ошибки:")
-            traceback.print_exc()
-            print("Используем встроенный шрифт Times-Roman")
-            self.FONT_NAME = 'Times-Roman'
-            self.FONT_NAME_BOLD = 'Times-Bold'
+            logger.exception("Ошибка при регистрации шрифтов: %s. Используем встроенный шрифт Times-Roman", e)
         
-        # Создаем стили
-        self.styles = getSampleStyleSheet()
-        self.styles.add(ParagraphStyle(
+        cls._FONTS_REGISTERED = True
+    
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _paragraph_styles(font_name, bold_font_name):
+        """
+        Создает таблицу стилей абзацев (одна на пару шрифтов, общая для всех генераторов)
+        
+        Args:
+            font_name (str): Имя обычного шрифта
+            bold_font_name (str): Имя полужирного шрифта
+        
+        Returns:
+            StyleSheet1: Стандартные стили reportlab и стили отчета
+        """
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            fontName=self.FONT_NAME_BOLD,
+            fontName=bold_font_name,
             fontSize=16,
             alignment=1,
             spaceAfter=30
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomHeading',
-            fontName=self.FONT_NAME_BOLD,
+            fontName=bold_font_name,
             fontSize=14,
             alignment=0,
             spaceAfter=12
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomNormal',
-            fontName=self.FONT_NAME,
+            fontName=font_name,
             fontSize=12,
             alignment=0,
             spaceAfter=12
         ))
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='Equation',
-            fontName=self.FONT_NAME,
+            fontName=font_name,
             fontSize=12,
             alignment=1,
             spaceAfter=12
         ))
+        return styles
+    
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def _table_styles(font_name):
+        """
+        Создает стили таблиц отчета (общие для всех генераторов с тем же шрифтом)
         
-        # Список временных файлов для удаления
-        self.temp_files = []
+        Args:
+            font_name (str): Имя шрифта таблиц
+        
+        Returns:
+            tuple: (обычный стиль, стиль широких таблиц)
+        """
+        table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 6),
+        ])
+        # Для широких таблиц (дисперсионный анализ, коэффициенты)
+        wide_table_style = TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),  # Уменьшаем размер шрифта
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 8),  # Увеличиваем отступы
+            ('WORDWRAP', (0, 0), (-1, -1), True),  # Включаем перенос слов
+            ('LEFTPADDING', (0, 0), (-1, -1), 4),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+        ])
+        return table_style, wide_table_style
+    
+    def __init__(self, figure_format='tiff'):
+        """
+        Args:
+            figure_format (str): Формат растра графиков в отчете: 'tiff', 'png' или 'jpeg'
+        """
+        if figure_format not in FIGURE_SAVE_OPTIONS:
+            raise ValueError(f"Неподдерживаемый формат графиков: {figure_format}")
+        self.figure_format = figure_format
+        
+        # Регистрируем шрифты из папки fonts
+        self._register_fonts()
+        
+        # Стили абзацев зависят только от шрифтов и строятся один раз
+        self.styles = self._paragraph_styles(self.FONT_NAME, self.FONT_NAME_BOLD)
+        # StyleSheet1.__getitem__ - метод Python, поэтому стили отчета берутся один раз
+        self._title_style = self.styles['CustomTitle']
+        self._heading_style = self.styles['CustomHeading']
+        self._normal_style = self.styles['CustomNormal']
+        self._equation_style = self.styles['Equation']
+        
+        # Стили таблиц создаются один раз и используются всеми таблицами отчета
+        self._table_style, self._wide_table_style = self._table_styles(self.FONT_NAME)
     
     def _ensure_unicode(self, text):
-        """Преобразует текст в Unicode"""
+        """Преобразует текст в Unicode (используется только для внешних данных отчета)"""
+        if isinstance(text, str):
+            return text
         if isinstance(text, bytes):
             return text.decode('utf-8')
         return str(text)
@@ -109,12 +366,12 @@ class ReportGenerator:
             figure_canvas: FigureCanvas из matplotlib
         
         Returns:
-            str: Путь к временному файлу с изображением или None в случае ошибки
+            ImageReader: Декодированное изображение (TIFF, PNG или JPEG) или None в случае ошибки
         """
         try:
             # Проверяем, что figure_canvas не None
             if figure_canvas is None:
-                print("Предупреждение: figure_canvas is None")
+                logger.warning("figure_canvas is None")
                 return None
             
             # Получаем figure из canvas
@@ -122,12 +379,12 @@ class ReportGenerator:
             
             # Проверяем, что figure не None
             if figure is None:
-                print("Предупреждение: figure is None")
+                logger.warning("figure is None")
                 return None
             
             # Проверяем, что figure содержит хотя бы один axes
             if not figure.axes:
-                print("Предупреждение: figure не содержит axes")
+                logger.warning("figure не содержит axes")
                 return None
             
             # Проверяем, что axes содержит данные
@@ -138,77 +395,90 @@ class ReportGenerator:
                     break
             
             if not has_data:
-                print("Предупреждение: figure не содержит данных для отображения")
+                logger.warning("figure не содержит данных для отображения")
                 return None
             
-            # Устанавливаем более высокое разрешение для графика
-            dpi = 150
-            
-            # Создаем временный файл
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            temp_file.close()
-            
-            # Сохраняем рисунок во временный файл
-            figure.savefig(temp_file.name, format='png', dpi=dpi, bbox_inches='tight')
-            
-            # Проверяем, что файл создался и не пустой
-            if not os.path.exists(temp_file.name) or os.path.getsize(temp_file.name) == 0:
-                print("Предупреждение: Временный файл не создался или пустой")
+            # Растеризуем график сразу в том размере, в котором он будет вставлен в отчет
+            # Изображение не кэшируется между отчетами: пользователь может изменить
+            # график (масштаб, сдвиг на панели инструментов) между сохранениями
+            dpi = max(72, int(IMAGE_WIDTH * PIXELS_PER_POINT / figure.get_figwidth()))
+            
+            # Сохраняем рисунок в память, без временного файла на диске
+            image = _render_figure(figure, dpi)
+            if self.figure_format == 'jpeg':
+                image = image.convert('RGB')
+            buf = BytesIO()
+            image.save(buf, format=self.figure_format, **FIGURE_SAVE_OPTIONS[self.figure_format])
+            
+            # Проверяем, что изображение не пустое
+            if buf.tell() == 0:
+                logger.warning("Изображение графика пустое")
                 return None
             
-            # Добавляем файл в список для последующего удаления
-            self.temp_files.append(temp_file.name)
-            
-            print(f"График успешно сохранен в {temp_file.name}")
-            return temp_file.name
+            # Декодируем изображение здесь (в том числе в потоках пула): reportlab
+            # берет пиксели из ImageReader и при сборке PDF уже не декодирует их
+            buf.seek(0)
+            reader = ImageReader(buf)
+            reader.getRGBData()
+            return reader
         
         except Exception as e:
-            print(f"Ошибка при конвертации графика: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Ошибка при конвертации графика: %s", e)
             return None
     
-    def _cleanup_temp_files(self):
-        """Удаляет все временные файлы"""
-        for file_path in self.temp_files:
-            try:
-                if os.path.exists(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                print(f"Ошибка при удалении временного файла {file_path}: {str(e)}")
-        self.temp_files = []
+    @staticmethod
+    def _probe_sections(equation, statistics, interpretation, figures):
+        """
+        Определяет, какие разделы отчета содержат данные (каждый контейнер просматривается один раз)
+        
+        Args:
+            equation (str): Уравнение регрессии
+            statistics (dict): Статистика регрессии
+            interpretation (dict): Интерпретация результатов
+            figures (list): Список графиков
+        
+        Returns:
+            dict: Флаги наличия разделов 'equation', 'statistics', 'interpretation', 'figures'
+        """
+        return {
+            'equation': bool(equation and equation.strip()),
+            'statistics': bool(statistics) and any(section for section in statistics.values()),
+            'interpretation': bool(interpretation) and any(
+                (isinstance(content, dict) and any(text and str(text).strip() for text in content.values()))
+                or (content and str(content).strip())
+                for section, content in interpretation.items() if section != 'error'),
+            'figures': bool(figures),
+        }
     
-    def generate_report(self, parent_widget, equation, statistics, interpretation, figures, model_type="Линейная регрессия"):
+    def generate_report(self, parent_widget, equation, statistics, interpretation, figures,
+                        model_type="Линейная регрессия", close_after=False):
+        """
+        Создает PDF-отчет и сохраняет его в выбранный пользователем файл
+        
+        Args:
+            parent_widget: Родительский виджет для диалога сохранения
+            equation (str): Уравнение регрессии
+            statistics (dict): Статистика регрессии
+            interpretation (dict): Интерпретация результатов
+            figures (list): Список FigureCanvas с графиками
+            model_type (str): Тип модели регрессии
+            close_after (bool): Закрыть графики после растеризации, если они больше
+                нигде не нужны (освобождает память до сборки PDF)
+        
+        Returns:
+            bool: True, если отчет успешно сохранен
+        """
         try:
-            print("Начало генерации отчета...")
+            logger.debug("Начало генерации отчета...")
             
             # Проверяем, есть ли хотя бы какой-то контент для отображения
-            has_content = False
-            if equation and equation.strip():
-                has_content = True
-                print("✓ Уравнение предоставлено")
-            else:
-                print("✗ Уравнение не предоставлено или пусто")
-            
-            if statistics and len(statistics) > 0:
-                has_content = True
-                print("✓ Статистика предоставлена")
-            else:
-                print("✗ Статистика не предоставлена или пуста")
-            
-            if interpretation and len(interpretation) > 0:
-                has_content = True
-                print("✓ Интерпретация предоставлена")
-            else:
-                print("✗ Интерпретация не предоставлена или пуста")
+            sections = self._probe_sections(equation, statistics, interpretation, figures)
+            if logger.isEnabledFor(logging.DEBUG):
+                for section, present in sections.items():
+                    logger.debug("%s %s", "✓" if present else "✗", SECTION_TITLES[section])
             
-            if figures and len(figures) > 0:
-                has_content = True
-                print("✓ Графики предоставлены")
-            else:
-                print("✗ Графики не предоставлены или список пуст")
-            
-            if not has_content:
-                print("ПРЕДУПРЕЖДЕНИЕ: Нет контента для отображения в отчете!")
+            if not any(sections.values()):
+                logger.warning("Нет контента для отображения в отчете!")
                 return False
             
             # Запрашиваем у пользователя место для сохранения отчета
@@ -223,141 +493,78 @@ class ReportGenerator:
             )
             
             if not file_path:
-                print("Пользователь отменил сохранение")
+                logger.debug("Пользователь отменил сохранение")
                 return False
             
             # Если пользователь не указал расширение .pdf, добавляем его
             if not file_path.lower().endswith('.pdf'):
                 file_path += '.pdf'
             
-            print(f"Путь для сохранения отчета: {file_path}")
+            logger.debug("Путь для сохранения отчета: %s", file_path)
             
             try:
-                # Создаем PDF документ
+                # Создаем PDF документ в памяти: файл записывается целиком после сборки
+                pdf_buffer = BytesIO()
                 doc = SimpleDocTemplate(
-                    file_path,
+                    pdf_buffer,
                     pagesize=landscape(A4),
                     rightMargin=72,
                     leftMargin=72,
                     topMargin=72,
                     bottomMargin=72
                 )
-                print("PDF документ успешно создан")
+                logger.debug("PDF документ успешно создан")
             except Exception as e:
-                print(f"Ошибка при создании PDF документа: {str(e)}")
+                logger.error("Ошибка при создании PDF документа: %s", e)
                 raise
             
-            print("Создаем элементы отчета...")
+            logger.debug("Создаем элементы отчета...")
             
             # Список элементов для добавления в документ
             elements = []
             # 1. Титульная страница
-            elements.append(Paragraph(self._ensure_unicode("Отчет по результатам"), self.styles['CustomTitle']))
-            elements.append(Paragraph(self._ensure_unicode(f"Дата создания: {current_date}"), self.styles['CustomNormal']))
+            elements.append(Paragraph("Отчет по результатам", self._title_style))
+            elements.append(Paragraph(f"Дата создания: {current_date}", self._normal_style))
             elements.append(Spacer(1, 20))
 
-            # Флаги наличия разделов
-            has_equation = equation and equation.strip()
-            has_statistics = statistics and len(statistics) > 0 and any(section and len(section) > 0 for section in statistics.values())
-            has_interpretation = interpretation and len(interpretation) > 0 and any(
-                (isinstance(content, dict) and any(text and str(text).strip() for text in content.values())) or (content and str(content).strip())
-                for section, content in interpretation.items() if section != 'error')
-            has_figures = figures and len(figures) > 0
-
             # 2. Уравнение
-            if has_equation:
-                elements.append(Paragraph(self._ensure_unicode("Уравнение регрессии:"), self.styles['CustomHeading']))
-                elements.append(Paragraph(self._ensure_unicode(equation), self.styles['Equation']))
+            if sections['equation']:
+                elements.append(Paragraph("Уравнение регрессии:", self._heading_style))
+                elements.append(Paragraph(self._ensure_unicode(equation), self._equation_style))
                 elements.append(Spacer(1, 20))
 
             # 3. Статистика
-            if has_statistics:
-                elements.append(Paragraph(self._ensure_unicode("Статистика регрессии"), self.styles['CustomHeading']))
+            if sections['statistics']:
+                elements.append(Paragraph("Статистика регрессии", self._heading_style))
                 
                 # Регрессионная статистика
                 if "Регрессионная статистика" in statistics:
-                    elements.append(Paragraph(self._ensure_unicode("Регрессионная статистика:"), self.styles['CustomNormal']))
-                    data = [[self._ensure_unicode("Показатель"), self._ensure_unicode("Значение")]]
-                    for key, value in statistics["Регрессионная статистика"].items():
-                        if isinstance(value, (int, float)):
-                            if key == "Наблюдения":
-                                value_str = str(int(value))
-                            else:
-                                value_str = "{:.4f}".format(value).replace(".", ",")
-                        else:
-                            value_str = "Н/Д"
-                        data.append([self._ensure_unicode(key), self._ensure_unicode(value_str)])
+                    elements.append(Paragraph("Регрессионная статистика:", self._normal_style))
+                    data = [["Показатель", "Значение"]] + [
+                        [self._ensure_unicode(key), _fmt_int(value) if key == "Наблюдения" else _fmt4(value)]
+                        for key, value in statistics["Регрессионная статистика"].items()
+                    ]
                     
-                    table = Table(data, colWidths=[300, 150])
-                    table.setStyle(TableStyle([
-                        ('FONTNAME', (0, 0), (-1, -1), self.FONT_NAME),
-                        ('FONTSIZE', (0, 0), (-1, -1), 11),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('PADDING', (0, 0), (-1, -1), 6),
-                    ]))
+                    table = Table(data, colWidths=REGRESSION_COL_WIDTHS)
+                    table.setStyle(self._table_style)
                     elements.append(table)
                     elements.append(Spacer(1, 20))
                 
                 # Дисперсионный анализ
                 if "Дисперсионный анализ" in statistics:
-                    elements.append(Paragraph(self._ensure_unicode("Дисперсионный анализ:"), self.styles['CustomNormal']))
+                    elements.append(Paragraph("Дисперсионный анализ:", self._normal_style))
                     
-                    # Создаем заголовки с переносом строк
-                    headers = [
-                        self._ensure_unicode("Источник"),
-                        self._ensure_unicode("df"),
-                        self._ensure_unicode("SS"),
-                        self._ensure_unicode("MS"),
-                        self._ensure_unicode("F"),
-                        self._ensure_unicode("Значимость\nF")
+                    anova = statistics["Дисперсионный анализ"]
+                    anova_rows = [(key, anova[key]) for key in ANOVA_ROWS if key in anova]
+                    data = [ANOVA_HEADERS] + [
+                        [key] + [
+                            formatter(row.get(col), "") for col, formatter in ANOVA_FORMATTERS.items()
+                        ]
+                        for key, row in anova_rows
                     ]
                     
-                    data = [headers]
-                    for key in ["Регрессия", "Остаток", "Итого"]:
-                        if key in statistics["Дисперсионный анализ"]:
-                            row = [self._ensure_unicode(key)]
-                            for col in ["df", "SS", "MS", "F", "Значимость F"]:
-                                value = statistics["Дисперсионный анализ"][key].get(col, "")
-                                if isinstance(value, (int, float)):
-                                    if col == "df":
-                                        value_str = str(int(value))
-                                    elif col == "Значимость F":
-                                        # Специальное форматирование для p-значений
-                                        if value < 1e-10:
-                                            value_str = "<1,0×10⁻¹⁰"
-                                        elif value < 0.0001:
-                                            value_str = "<0,0001"
-                                        else:
-                                            value_str = "{:.4f}".format(value).replace(".", ",")
-                                    elif col == "F":
-                                        value_str = "{:.4f}".format(value).replace(".", ",")
-                                    elif col == "SS" and abs(value) > 1000000:
-                                        # Для больших значений SS используем научную нотацию
-                                        value_str = "{:.2e}".format(value).replace(".", ",").replace("e", "×10^")
-                                    else:
-                                        value_str = "{:.2f}".format(value).replace(".", ",")
-                                else:
-                                    value_str = ""
-                                row.append(self._ensure_unicode(value_str))
-                            data.append(row)
-                    
-                    # Увеличиваем ширину колонки SS и других колонок
-                    table = Table(data, colWidths=[150, 80, 140, 120, 100, 120])
-                    table.setStyle(TableStyle([
-                        ('FONTNAME', (0, 0), (-1, -1), self.FONT_NAME),
-                        ('FONTSIZE', (0, 0), (-1, -1), 10),  # Уменьшаем размер шрифта
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('PADDING', (0, 0), (-1, -1), 8),  # Увеличиваем отступы
-                        ('WORDWRAP', (0, 0), (-1, -1), True),  # Включаем перенос слов
-                        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                    ]))
+                    table = Table(data, colWidths=ANOVA_COL_WIDTHS)
+                    table.setStyle(self._wide_table_style)
                     elements.append(table)
                     elements.append(Spacer(1, 20))
                 
@@ -366,172 +573,115 @@ class ReportGenerator:
                     # Проверяем, есть ли данные для отображения
                     coefficients_data = statistics["Коэффициенты"]
                     if coefficients_data and len(coefficients_data) > 0:
-                        elements.append(Paragraph(self._ensure_unicode("Коэффициенты:"), self.styles['CustomNormal']))
+                        elements.append(Paragraph("Коэффициенты:", self._normal_style))
                     
-                        # Создаем заголовки с переносом строк
-                        headers = [
-                            self._ensure_unicode("Переменная"),
-                            self._ensure_unicode("Коэффициент"),
-                            self._ensure_unicode("Стд.\nошибка"),
-                            self._ensure_unicode("t-стат"),
-                            self._ensure_unicode("P-Значение"),
-                            self._ensure_unicode("Нижние\n95%"),
-                            self._ensure_unicode("Верхние\n95%")
+                        data = [COEFFICIENT_HEADERS] + [
+                            [_wrap_variable_name(self._ensure_unicode(key))] + [
+                                formatter(values.get(col)) for col, formatter in COEFFICIENT_FORMATTERS.items()
+                            ]
+                            for key, values in coefficients_data.items()
                         ]
                         
-                        data = [headers]
-                        for key, values in statistics["Коэффициенты"].items():
-                            # Добавляем перенос строк для длинных названий переменных
-                            if len(key) > 15:
-                                # Разбиваем длинные названия на несколько строк
-                                words = key.split()
-                                if len(words) > 2:
-                                    # Если больше 2 слов, разбиваем на строки по 2 слова
-                                    wrapped_key = []
-                                    for i in range(0, len(words), 2):
-                                        wrapped_key.append(' '.join(words[i:i+2]))
-                                    key = '\n'.join(wrapped_key)
-                                elif len(key) > 25:
-                                    # Если название очень длинное, разбиваем по символам
-                                    # Ищем пробелы для разбиения
-                                    if ' ' in key:
-                                        parts = key.split(' ')
-                                        # Разбиваем на части примерно по 15 символов
-                                        wrapped_key = []
-                                        current_line = ""
-                                        for part in parts:
-                                            if len(current_line + part) <= 15:
-                                                current_line += (part + " ")
-                                            else:
-                                                if current_line:
-                                                    wrapped_key.append(current_line.strip())
-                                                current_line = part + " "
-                                        if current_line:
-                                            wrapped_key.append(current_line.strip())
-                                        key = '\n'.join(wrapped_key)
-                        
-                            row = [self._ensure_unicode(key)]
-                            for col in ["Коэффициент", "Стандартная ошибка", "t-статистика", "P-Значение", "Нижние 95%", "Верхние 95%"]:
-                                value = values.get(col, "")
-                                if isinstance(value, (int, float)):
-                                    if col == "P-Значение":
-                                        # Специальное форматирование для p-значений
-                                        if value < 1e-10:
-                                            value_str = "<1,0×10⁻¹⁰"
-                                        elif value < 0.0001:
-                                            value_str = "<0,0001"
-                                        else:
-                                            value_str = "{:.4f}".format(value).replace(".", ",")
-                                    else:
-                                        value_str = "{:.4f}".format(value).replace(".", ",")
-                                else:
-                                    value_str = "Н/Д"
-                                row.append(self._ensure_unicode(value_str))
-                            data.append(row)
-                        
-                        # Увеличиваем ширину колонок для лучшего отображения
-                        # Автоматически определяем ширину колонок в зависимости от содержимого
-                        total_width = 750  # Общая ширина для горизонтальной ориентации
-                        
-                        # Определяем ширину колонок на основе содержимого
-                        col_widths = []
-                        
-                        # Первая колонка (Переменная) - шире для длинных названий
-                        col_widths.append(200)
-                        
-                        # Остальные колонки - равномерно распределяем оставшееся место
-                        remaining_width = total_width - 200
-                        other_cols_width = remaining_width // 6  # 6 остальных колонок
-                        
-                        for i in range(6):
-                            col_widths.append(other_cols_width)
-                        
-                        table = Table(data, colWidths=col_widths)
-                        table.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, -1), self.FONT_NAME),
-                            ('FONTSIZE', (0, 0), (-1, -1), 10),  # Уменьшаем размер шрифта
-                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('PADDING', (0, 0), (-1, -1), 8),  # Увеличиваем отступы
-                            ('WORDWRAP', (0, 0), (-1, -1), True),  # Включаем перенос слов
-                            ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                        ]))
+                        # Заголовок повторяется на каждой странице длинной таблицы
+                        table_cls = LongTable if len(data) > LONG_TABLE_MIN_ROWS else Table
+                        table = table_cls(data, colWidths=COEFFICIENT_COL_WIDTHS, repeatRows=1)
+                        table.setStyle(self._wide_table_style)
                         elements.append(table)
                         elements.append(Spacer(1, 20))
 
             # 4. Интерпретация
-            if has_interpretation:
-                elements.append(Paragraph(self._ensure_unicode("Интерпретация результатов"), self.styles['CustomHeading']))
+            if sections['interpretation']:
+                elements.append(Paragraph("Интерпретация результатов", self._heading_style))
                 
                 for section, content in interpretation.items():
                     if section == 'error':
                         continue
                     
-                    elements.append(Paragraph(self._ensure_unicode(section), self.styles['CustomNormal']))
+                    elements.append(Paragraph(escape(self._ensure_unicode(section)), self._normal_style))
                     
                     if isinstance(content, dict):
-                        for subsection, text in content.items():
-                            if text:
-                                elements.append(Paragraph(self._ensure_unicode(f"{subsection}:"), self.styles['CustomNormal']))
-                                elements.append(Paragraph(self._ensure_unicode(text), self.styles['CustomNormal']))
+                        # Все подразделы раздела собираются в один абзац: reportlab
+                        # разбирает и верстает один Paragraph вместо двух на подраздел
+                        parts = [
+                            f"<b>{escape(self._ensure_unicode(subsection))}:</b><br/>{escape(self._ensure_unicode(text))}"
+                            for subsection, text in content.items() if text
+                        ]
+                        if parts:
+                            elements.append(Paragraph("<br/><br/>".join(parts), self._normal_style))
                     else:
                         if content:
-                            elements.append(Paragraph(self._ensure_unicode(content), self.styles['CustomNormal']))
+                            elements.append(Paragraph(escape(self._ensure_unicode(content)), self._normal_style))
                     
                     elements.append(Spacer(1, 12))
 
             # 5. Графики (следуют друг за другом естественно)
-            if has_figures:
-                for i, figure in enumerate(figures):
-                    img_path = self._figure_to_image(figure)
-                    if img_path:
+            if sections['figures']:
+                # Растеризация (Agg) и сжатие освобождают GIL, поэтому разные графики
+                # сохраняются параллельно; в цикле ниже только собираются элементы отчета
+                # Повторяющийся в списке график растеризуется один раз; его копии получают
+                # тот же ImageReader, и reportlab встраивает изображение в PDF однократно
+                unique_figures = list(dict.fromkeys(figures))
+                if len(unique_figures) > 1:
+                    with ThreadPoolExecutor(max_workers=min(len(unique_figures), os.cpu_count() or 1)) as pool:
+                        rendered = dict(zip(unique_figures, pool.map(self._figure_to_image, unique_figures)))
+                else:
+                    rendered = {figure: self._figure_to_image(figure) for figure in unique_figures}
+                images = [rendered[figure] for figure in figures]
+                
+                # Для отчета нужны только байты изображений: графики и их холсты
+                # можно освободить до сборки PDF
+                if close_after:
+                    # pyplot нужен только для графиков, созданных через него
+                    # (им нужно снять регистрацию в pyplot); импортируем его по требованию
+                    import matplotlib.pyplot as plt
+                    for figure_canvas in figures:
+                        if figure_canvas is not None and figure_canvas.figure is not None:
+                            figure_canvas.figure.clf()
+                            plt.close(figure_canvas.figure)
+                
+                for i, img_data in enumerate(images):
+                    if img_data:
                         # Сначала график, потом заголовок
-                        img = Image(img_path, width=500, height=350)
+                        img = _ReaderImage(img_data, width=IMAGE_WIDTH, height=IMAGE_HEIGHT)
                         elements.append(img)
-                        elements.append(Paragraph(self._ensure_unicode(f"График {i+1}"), self.styles['CustomHeading']))
+                        elements.append(Paragraph(f"График {i+1}", self._heading_style))
                         elements.append(Spacer(1, 20))
 
             # В конце — если последний элемент PageBreak, удаляем его
-            if elements and hasattr(elements[-1], '__class__') and 'PageBreak' in str(elements[-1].__class__):
+            # (это может вызывать пустую страницу в конце)
+            if elements and isinstance(elements[-1], PageBreak):
+                logger.debug("Последний элемент - PageBreak, удаляем его")
                 elements.pop()
             
-            print("Создаем PDF...")
+            logger.debug("Создаем PDF...")
             try:
                 # Финальная проверка: есть ли элементы для отображения
                 if not elements:
-                    print("ОШИБКА: Нет элементов для отображения в PDF!")
-                    print("Проверьте, что предоставлены данные для отчета")
+                    logger.error("Нет элементов для отображения в PDF! Проверьте, что предоставлены данные для отчета")
                     return False
                 
-                # Проверяем, что последний элемент не является PageBreak
-                # (это может вызывать пустую страницу в конце)
-                if elements and hasattr(elements[-1], '__class__') and 'PageBreak' in str(elements[-1].__class__):
-                    print("Предупреждение: Последний элемент - PageBreak, удаляем его")
-                    elements.pop()
-                
-                print(f"Количество элементов для добавления в PDF: {len(elements)}")
+                logger.debug("Количество элементов для добавления в PDF: %d", len(elements))
                 
                 # Создаем PDF
                 doc.build(elements)
-                print("Отчет успешно создан")
-                
-                # Удаляем временные файлы после успешного создания PDF
-                self._cleanup_temp_files()
+                # Записываем во временный файл рядом и заменяем им целевой: при сбое
+                # записи прежний отчет с тем же именем не превращается в обрывок
+                part_path = file_path + '.part'
+                try:
+                    with open(part_path, 'wb') as f:
+                        f.write(pdf_buffer.getbuffer())
+                    os.replace(part_path, file_path)
+                except OSError:
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    raise
+                logger.debug("Отчет успешно создан")
                 
                 return True
             except Exception as e:
-                print(f"Ошибка при создании PDF: {str(e)}")
-                # Удаляем временные файлы даже в случае ошибки
-                self._cleanup_temp_files()
+                logger.error("Ошибка при создании PDF: %s", e)
                 raise
             
         except Exception as e:
-            print(f"Ошибка при создании отчета: {str(e)}")
-            print("Трассировка ошибки:")
-            traceback.print_exc()
-            # Удаляем временные файлы в случае ошибки
-            self._cleanup_temp_files()
+            logger.exception("Ошибка при создании отчета: %s", e)
             return False
\ No newline at end of file
@@ -2,8 +2,10 @@
 Модуль для управления стилями и темами приложения
 """
 
-from PyQt5.QtGui import QFont, QColor, QPalette, QBrush, QLinearGradient
-from PyQt5.QtCore import Qt
+import os
+
+from PyQt5.QtGui import QFont, QColor, QPalette, QBrush, QLinearGradient, QIcon
+from PyQt5.QtCore import Qt, QSize
 
 # Цветовая схема
 COLORS = {
@@ -25,6 +27,10 @@ COLORS = {
     'info': '#1976D2'  # Информация
 }
 
+# Директория с иконками и размеры, в которых create_icons.py сохраняет каждую иконку
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons')
+ICON_SIZES = (16, 24, 32, 48, 64, 128)
+
 # Шрифты
 FONTS = {
     'header': QFont('Segoe UI', 12, QFont.Bold),
@@ -448,4 +454,29 @@ def create_gradient_button(button, start_color=COLORS['primary'], end_color=COLO
             color: #757575;
         }}
     """
-    button.setStyleSheet(gradient_style)
\ No newline at end of file
+    button.setStyleSheet(gradient_style)
+
+def load_icon(name):
+    """
+    Загружает иконку со всеми заранее отрисованными размерами
+    
+    Qt выбирает ближайший готовый размер, вместо того чтобы
+    масштабировать одно изображение при каждой отрисовке.
+    
+    Args:
+        name (str): Имя иконки (без размера и расширения)
+    
+    Returns:
+        QIcon: Иконка
+    """
+    icon = QIcon()
+    for size in ICON_SIZES:
+        path = os.path.join(ICONS_DIR, f"{name}_{size}.png")
+        if os.path.exists(path):
+            icon.addFile(path, QSize(size, size))
+    
+    # Если набор размеров не создан, используем одиночный файл иконки
+    if icon.isNull():
+        icon.addFile(os.path.join(ICONS_DIR, f"{name}.png"))
+    
+    return icon
@@ -6,7 +6,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
-from ui.styles import COLORS, FONTS, set_font, set_widget_style, create_gradient_button
+from ui.styles import COLORS, FONTS, set_font, set_widget_style, create_gradient_button, load_icon
+from utils.base_plotter import DECIMAL_COMMA
 
 
 class FileSelectionWidget(QWidget):
@@ -503,7 +504,7 @@ class ResultsWidget(QWidget):
         
         # Кнопка для сохранения отчета
         self.save_report_button = QPushButton("Сохранить отчет")
-        self.save_report_button.setIcon(QIcon("ui/icons/file.png"))
+        self.save_report_button.setIcon(load_icon("file"))
         self.save_report_button.setMinimumHeight(40)
         self.save_report_button.setMinimumWidth(200)
         self.save_report_button.setStyleSheet("""
@@ -1214,10 +1215,10 @@ class ResultsWidget(QWidget):
                 return f"{value:,.2f}".replace(",", " ")
             # Для маленьких чисел используем 4-6 значащих цифр
             elif abs(value) >= 0.001:
-                return f"{value:.4f}".replace(".", ",")
+                return f"{value:.4f}".translate(DECIMAL_COMMA)
             # Для очень маленьких чисел используем научную нотацию
             elif value != 0:
-                return f"{value:.4e}".replace(".", ",")
+                return f"{value:.4e}".translate(DECIMAL_COMMA)
             else:
                 return "0"
         else:
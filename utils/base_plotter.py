@@ -41,6 +41,9 @@ try:
 except ImportError:
     pass
 
+# Таблица замены десятичной точки на запятую для форматирования чисел (подписи графиков, таблицы)
+DECIMAL_COMMA = str.maketrans('.', ',')
+
 
 class BasePlotter:
     """Базовый класс для всех плоттеров с общими утилитами"""
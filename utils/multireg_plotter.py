@@ -8,7 +8,7 @@ import traceback
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.ticker import FuncFormatter, MaxNLocator
-from utils.base_plotter import BasePlotter, HAS_AXES_GRID, HAS_3D, HAS_SKLEARN
+from utils.base_plotter import BasePlotter, HAS_AXES_GRID, HAS_3D, HAS_SKLEARN, DECIMAL_COMMA
 
 # Import additional libraries if available
 if HAS_AXES_GRID:
@@ -131,8 +131,8 @@ class MultiRegPlotter(BasePlotter):
             ax.plot(line_range, line_range, color='red', linestyle='--', linewidth=2)
             
             # Add model quality information
-            r2_str = f"{model.r_squared:.4f}".replace('.', ',')
-            adj_r2_str = f"{model.adjusted_r_squared:.4f}".replace('.', ',')
+            r2_str = f"{model.r_squared:.4f}".translate(DECIMAL_COMMA)
+            adj_r2_str = f"{model.adjusted_r_squared:.4f}".translate(DECIMAL_COMMA)
             text_box = ax.text(0.02, 0.95, 
                              f"R² = {r2_str}\nСкорр. R² = {adj_r2_str}", 
                              transform=ax.transAxes, fontsize=12, 
@@ -733,11 +733,11 @@ class MultiRegPlotter(BasePlotter):
             p_value_text = ""
             if hasattr(model, 'coef_p_values') and model.coef_p_values is not None:
                 p_value = model.coef_p_values[feature_index]
-                p_value_str = f"{p_value:.4f}".replace('.', ',')
+                p_value_str = f"{p_value:.4f}".translate(DECIMAL_COMMA)
                 significance = "значимый" if p_value < 0.05 else "незначимый"
                 p_value_text = f"\np-зн = {p_value_str} ({significance})"
             
-            coef_str = f"{coef:.4f}".replace('.', ',')
+            coef_str = f"{coef:.4f}".translate(DECIMAL_COMMA)
             text_box = ax.text(0.02, 0.95, 
                             f"Коэф = {coef_str}{p_value_text}", 
                             transform=ax.transAxes, fontsize=12, 
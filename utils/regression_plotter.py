@@ -7,7 +7,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import numpy as np
 import traceback
-from utils.base_plotter import BasePlotter
+from utils.base_plotter import BasePlotter, DECIMAL_COMMA
 
 
 class RegressionPlotter(BasePlotter):
@@ -66,7 +66,7 @@ class RegressionPlotter(BasePlotter):
             try:
                 # Создаем более гладкую линию регрессии с большим количеством точек
                 line_x = np.linspace(np.min(X_valid) * 0.98, np.max(X_valid) * 1.02, 100)
-                line_y = model.predict(line_x.reshape(-1, 1))
+                line_y = model.predict_1d(line_x)
                 
                 # Строим линию регрессии
                 line, = ax.plot(line_x, line_y, color='red', linewidth=2.5, 
@@ -74,9 +74,9 @@ class RegressionPlotter(BasePlotter):
                 
                 # Добавляем уравнение регрессии и коэффициент детерминации
                 # Форматируем числа в российском стиле (запятые вместо точек для десятичных)
-                slope_str = f"{model.slope:.4f}".replace('.', ',')
-                intercept_str = f"{model.intercept:.4f}".replace('.', ',')
-                r2_str = f"{model.r_squared:.4f}".replace('.', ',')
+                slope_str = f"{model.slope:.4f}".translate(DECIMAL_COMMA)
+                intercept_str = f"{model.intercept:.4f}".translate(DECIMAL_COMMA)
+                r2_str = f"{model.r_squared:.4f}".translate(DECIMAL_COMMA)
                 
                 equation = f"y = {slope_str}x + {intercept_str}"
                 r_squared = f"R² = {r2_str}"